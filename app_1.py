@@ -6,21 +6,38 @@
 
 import streamlit as st
 import pandas as pd
+from cryptodash.analytics import extreme_moves, filter_window
+from cryptodash.data_service import DataService
+from cryptodash.indicators import SMA_WINDOWS
+from cryptodash.correlation import CorrelationMatrix, WINDOWS
+from cryptodash.charts import correlation_figure
 import numpy as np
 
 # Load Data
-@st.cache
-def load_data():
-    data = pd.read_csv('data.csv', parse_dates=['Date'])
-    return data
+# One read-only copy per process, shared by every session; the
+# percent-change columns are computed once when it is built
+@st.cache_resource
+def load_service():
+    return DataService('data.csv')
 
-data = load_data()
+service = load_service()
+data = service.data
+
+# Indicators for every coin, computed once in a single pass
+indicators = service.indicators
+
+# Cross-coin return correlations; rolling tensors are cached per window
+@st.cache_resource
+def load_correlations():
+    return CorrelationMatrix(load_service().data)
+
+correlations = load_correlations()
 
 # Sidebar with crypto selector
 crypto_list = data['Name'].unique()
 selected_crypto = st.sidebar.selectbox('Select Cryptocurrency', crypto_list)
 
-filtered_data = data[data['Name'] == selected_crypto]
+filtered_data, _ = filter_window(service, selected_crypto)
 
 # Title
 st.title(f'{selected_crypto} Metrics Dashboard')
@@ -42,17 +59,15 @@ st.line_chart(filtered_data.set_index('Date')[['High', 'Low']])
 st.markdown("The historical high vs low prices chart visualizes the trading range of the cryptocurrency. It helps to understand price volatility and potential support/resistance levels.")
 
 # Price Changes
-filtered_data['Price Change (%)'] = ((filtered_data['Close'] - filtered_data['Open']) / filtered_data['Open']) * 100
 st.subheader('Price Changes (%)')
 st.line_chart(filtered_data.set_index('Date')['Price Change (%)'])
 st.markdown("The price changes chart depicts the percentage change between the opening and closing prices. It reveals intraday price movements and trends.")
 
 # Extreme Price Movements
 st.subheader('Extreme Price Movements')
-max_price_increase = filtered_data['Price Change (%)'].idxmax()
-max_price_decrease = filtered_data['Price Change (%)'].idxmin()
-st.write(f"Day with Largest Increase: {filtered_data.loc[max_price_increase, 'Date']} ({filtered_data.loc[max_price_increase, 'Price Change (%)']:.2f}%)")
-st.write(f"Day with Largest Decrease: {filtered_data.loc[max_price_decrease, 'Date']} ({filtered_data.loc[max_price_decrease, 'Price Change (%)']:.2f}%)")
+extremes = extreme_moves(filtered_data)
+st.write(f"Day with Largest Increase: {extremes['Largest Increase Date']} ({extremes['Largest Increase (%)']:.2f}%)")
+st.write(f"Day with Largest Decrease: {extremes['Largest Decrease Date']} ({extremes['Largest Decrease (%)']:.2f}%)")
 
 # Price Range Distribution
 st.subheader('Price Range Distribution')
@@ -63,11 +78,10 @@ st.markdown("The price range distribution chart groups closing prices into bins,
 
 # Moving Averages
 st.subheader('Moving Averages')
-window_sizes = [10, 20, 50]
-for window in window_sizes:
-    filtered_data[f'Moving Avg {window}'] = filtered_data['Close'].rolling(window=window).mean()
-    st.line_chart(filtered_data.set_index('Date')[f'Moving Avg {window}'])
-st.markdown("The moving averages charts display the trend by smoothing out price fluctuations over different time periods.")
+moving_averages = indicators.slice(filtered_data)[[f'SMA {window}' for window in SMA_WINDOWS]]
+moving_averages.columns = [f'Moving Avg {window}' for window in SMA_WINDOWS]
+st.line_chart(moving_averages.set_index(filtered_data['Date']))
+st.markdown("The moving averages chart displays the trend by smoothing out price fluctuations over different time periods.")
 
 # Correlation Analysis
 st.subheader('Correlation Analysis')
@@ -75,6 +89,15 @@ correlation_matrix = filtered_data[['Open', 'High', 'Low', 'Close', 'Volume', 'M
 st.write(correlation_matrix)
 st.markdown("The correlation analysis table shows how different metrics are correlated. A value closer to 1 indicates strong positive correlation, while a value closer to -1 indicates strong negative correlation.")
 
+# Cross-Coin Correlation
+st.subheader('Cross-Coin Correlation')
+correlation_window = st.selectbox('Rolling Window (days)', WINDOWS, index=1)
+correlation_date = st.slider('Window End', min_value=correlations.dates[0].date(),
+                             max_value=correlations.dates[-1].date(), value=correlations.dates[-1].date())
+st.plotly_chart(correlation_figure(correlations.at(correlation_window, correlation_date),
+                                   f'{correlation_window}-Day Return Correlation up to {correlation_date}'))
+st.markdown("The heatmap shows how the daily returns of the cryptocurrencies moved together over the selected window. Move the slider to see how the relationships changed over time.")
+
 # Footer
 st.write('Data Source: your_data_source_here')
 st.markdown("Dashboard created by [Your Name]")
@@ -1,14 +1,17 @@
 import streamlit as st
-import pandas as pd
+from cryptodash.analytics import extreme_moves, filter_window
+from cryptodash.data_service import DataService
 import numpy as np
 
 # Load Data
-@st.cache
-def load_data():
-    data = pd.read_csv('data.csv', parse_dates=['Date'])
-    return data
+# One read-only copy per process, shared by every session; the
+# percent-change columns are computed once when it is built
+@st.cache_resource
+def load_service():
+    return DataService('data.csv')
 
-data = load_data()
+service = load_service()
+data = service.data
 
 # Sidebar with crypto selector
 crypto_list = data['Name'].unique()
@@ -18,11 +21,7 @@ selected_crypto = st.sidebar.selectbox('Select Cryptocurrency', crypto_list)
 start_date = st.sidebar.date_input("Start Date", data['Date'].min())
 end_date = st.sidebar.date_input("End Date", data['Date'].max())
 
-# Convert start_date and end_date to Timestamp objects
-start_date = pd.Timestamp(start_date)
-end_date = pd.Timestamp(end_date)
-
-filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date) & (data['Date'] <= end_date)]
+filtered_data, _ = filter_window(service, selected_crypto, start_date, end_date)
 
 # Title
 st.title(f'{selected_crypto} Metrics Dashboard')
@@ -40,16 +39,14 @@ st.subheader('Historical High vs Low Prices')
 st.line_chart(filtered_data.set_index('Date')[['High', 'Low']])
 
 # Price Changes
-filtered_data['Price Change (%)'] = ((filtered_data['Close'] - filtered_data['Open']) / filtered_data['Open']) * 100
 st.subheader('Price Changes (%)')
 st.line_chart(filtered_data.set_index('Date')['Price Change (%)'])
 
 # Extreme Price Movements
 st.subheader('Extreme Price Movements')
-max_price_increase = filtered_data['Price Change (%)'].idxmax()
-max_price_decrease = filtered_data['Price Change (%)'].idxmin()
-st.write(f"Day with Largest Increase: {filtered_data.loc[max_price_increase, 'Date']} ({filtered_data.loc[max_price_increase, 'Price Change (%)']:.2f}%)")
-st.write(f"Day with Largest Decrease: {filtered_data.loc[max_price_decrease, 'Date']} ({filtered_data.loc[max_price_decrease, 'Price Change (%)']:.2f}%)")
+extremes = extreme_moves(filtered_data)
+st.write(f"Day with Largest Increase: {extremes['Largest Increase Date']} ({extremes['Largest Increase (%)']:.2f}%)")
+st.write(f"Day with Largest Decrease: {extremes['Largest Decrease Date']} ({extremes['Largest Decrease (%)']:.2f}%)")
 
 # Footer
 st.write('Data Source: your_data_source_here')
@@ -1,14 +1,17 @@
 import streamlit as st
-import pandas as pd
+from cryptodash.analytics import extreme_moves, filter_window, per_coin, top_and_worst
+from cryptodash.data_service import DataService
 import numpy as np
 
 # Load Data
-@st.cache
-def load_data():
-    data = pd.read_csv('data.csv', parse_dates=['Date'])
-    return data
+# One read-only copy per process, shared by every session; the
+# percent-change columns are computed once when it is built
+@st.cache_resource
+def load_service():
+    return DataService('data.csv')
 
-data = load_data()
+service = load_service()
+data = service.data
 
 # Sidebar with crypto selector
 crypto_list = data['Name'].unique()
@@ -21,17 +24,8 @@ end_date = st.sidebar.date_input("End Date", data['Date'].max())
 # Percent Change Time Frame Selector
 time_frame = st.sidebar.selectbox("Percent Change Time Frame", ["1 month", "7 days", "24 hours"])
 
-# Convert start_date and end_date to Timestamp objects
-start_date = pd.Timestamp(start_date)
-end_date = pd.Timestamp(end_date)
-
 # Filter data based on selected time frame
-if time_frame == "1 month":
-    filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(months=1)) & (data['Date'] <= end_date)]
-elif time_frame == "7 days":
-    filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(days=7)) & (data['Date'] <= end_date)]
-elif time_frame == "24 hours":
-    filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(hours=24)) & (data['Date'] <= end_date)]
+filtered_data, _ = filter_window(service, selected_crypto, start_date, end_date, time_frame)
 
 # Title
 st.title(f'{selected_crypto} Metrics Dashboard')
@@ -49,27 +43,24 @@ st.subheader('Historical High vs Low Prices')
 st.line_chart(filtered_data.set_index('Date')[['High', 'Low']])
 
 # Price Changes
-filtered_data['Price Change (%)'] = ((filtered_data['Close'] - filtered_data['Open']) / filtered_data['Open']) * 100
 st.subheader('Price Changes (%)')
 st.line_chart(filtered_data.set_index('Date')['Price Change (%)'])
 
 # Extreme Price Movements
 st.subheader('Extreme Price Movements')
-max_price_increase = filtered_data['Price Change (%)'].idxmax()
-max_price_decrease = filtered_data['Price Change (%)'].idxmin()
-st.write(f"Day with Largest Increase: {filtered_data.loc[max_price_increase, 'Date']} ({filtered_data.loc[max_price_increase, 'Price Change (%)']:.2f}%)")
-st.write(f"Day with Largest Decrease: {filtered_data.loc[max_price_decrease, 'Date']} ({filtered_data.loc[max_price_decrease, 'Price Change (%)']:.2f}%)")
+extremes = extreme_moves(filtered_data)
+st.write(f"Day with Largest Increase: {extremes['Largest Increase Date']} ({extremes['Largest Increase (%)']:.2f}%)")
+st.write(f"Day with Largest Decrease: {extremes['Largest Decrease Date']} ({extremes['Largest Decrease (%)']:.2f}%)")
 
 
 # Top 3 Performers
 st.subheader('Top 3 Performers')
-top_performers = filtered_data.groupby('Name')['Price Change (%)'].sum().nlargest(3)
+top_performers, worst_performers = top_and_worst(per_coin(filtered_data, 'Price Change (%)', 'sum'))
 for performer, percentage in top_performers.items():
     st.write(f"{performer}: {percentage:.2f}%")
 
 # Worst 3 Performers
 st.subheader('Worst 3 Performers')
-worst_performers = filtered_data.groupby('Name')['Price Change (%)'].sum().nsmallest(3)
 for performer, percentage in worst_performers.items():
     st.write(f"{performer}: {percentage:.2f}%")
 
@@ -1,15 +1,16 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+from cryptodash.analytics import compare, extreme_moves, filter_window, top_and_worst
+from cryptodash.data_service import DataService
 
 # Load Data
-@st.cache
-def load_data():
-    data = pd.read_csv('data.csv', parse_dates=['Date'])
-    return data
+# One read-only copy per process, shared by every session; the
+# percent-change columns are computed once when it is built
+@st.cache_resource
+def load_service():
+    return DataService('data.csv')
 
-data = load_data()
+service = load_service()
+data = service.data
 
 # Sidebar with crypto selector
 st.sidebar.markdown("## Cryptocurrency Metrics Dashboard")
@@ -25,25 +26,9 @@ end_date = st.sidebar.date_input("End Date", data['Date'].max())
 st.sidebar.markdown("### Time Frame for Percent Change")
 time_frame = st.sidebar.selectbox("Select Time Frame", ["1 month", "7 days", "24 hours"])
 
-# Convert start_date and end_date to Timestamp objects
-start_date = pd.Timestamp(start_date)
-end_date = pd.Timestamp(end_date)
-
 # Filter data based on selected time frame and cryptocurrency
-if selected_crypto == 'All':
-    if time_frame == "1 month":
-        filtered_data = data[(data['Date'] >= start_date - pd.DateOffset(months=1)) & (data['Date'] <= end_date)]
-    elif time_frame == "7 days":
-        filtered_data = data[(data['Date'] >= start_date - pd.DateOffset(days=7)) & (data['Date'] <= end_date)]
-    elif time_frame == "24 hours":
-        filtered_data = data[(data['Date'] >= start_date - pd.DateOffset(hours=24)) & (data['Date'] <= end_date)]
-else:
-    if time_frame == "1 month":
-        filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(months=1)) & (data['Date'] <= end_date)]
-    elif time_frame == "7 days":
-        filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(days=7)) & (data['Date'] <= end_date)]
-    elif time_frame == "24 hours":
-        filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(hours=24)) & (data['Date'] <= end_date)]
+crypto = None if selected_crypto == 'All' else selected_crypto
+filtered_data, _ = filter_window(service, crypto, start_date, end_date, time_frame)
 
 # Title
 st.title('Cryptocurrency Metrics Dashboard')
@@ -61,16 +46,14 @@ st.subheader('Historical Market Trends')
 st.area_chart(filtered_data.set_index('Date')[['Open', 'High', 'Low', 'Close']])
 
 # Price Changes
-filtered_data['Price Change (%)'] = ((filtered_data['Close'] - filtered_data['Open']) / filtered_data['Open']) * 100
 st.subheader('Price Changes (%)')
 st.bar_chart(filtered_data.set_index('Date')['Price Change (%)'])
 
 # Extreme Price Movements
 st.subheader('Extreme Price Movements')
-max_price_increase = filtered_data['Price Change (%)'].idxmax()
-max_price_decrease = filtered_data['Price Change (%)'].idxmin()
-st.write(f"Day with Largest Increase: {filtered_data.loc[max_price_increase, 'Date']} ({filtered_data.loc[max_price_increase, 'Price Change (%)']:.2f}%)")
-st.write(f"Day with Largest Decrease: {filtered_data.loc[max_price_decrease, 'Date']} ({filtered_data.loc[max_price_decrease, 'Price Change (%)']:.2f}%)")
+extremes = extreme_moves(filtered_data)
+st.write(f"Day with Largest Increase: {extremes['Largest Increase Date']} ({extremes['Largest Increase (%)']:.2f}%)")
+st.write(f"Day with Largest Decrease: {extremes['Largest Decrease Date']} ({extremes['Largest Decrease (%)']:.2f}%)")
 
 # Compare Performance of All Cryptocurrencies
 st.subheader('Compare Performance of All Cryptocurrencies')
@@ -78,8 +61,11 @@ st.subheader('Compare Performance of All Cryptocurrencies')
 # Select the parameter to compare (e.g., "Price Change (%)")
 comparison_parameter = st.selectbox("Select Parameter to Compare", ["Volume", "Marketcap", "High", "Low", "Price Change (%)"])
 
-# Group data by cryptocurrency and calculate the mean for the selected parameter
-grouped_data = data.groupby('Name')[comparison_parameter].mean().sort_values()
+# Mean of the selected parameter per cryptocurrency, from the precomputed cube
+grouped_data = compare(service, comparison_parameter)
+
+# Matplotlib is loaded only here, so the rest of the page renders without waiting for it
+import matplotlib.pyplot as plt
 
 # Create a bar chart to visualize the performance
 plt.figure(figsize=(10, 6))
@@ -90,8 +76,7 @@ plt.title(f'Average {comparison_parameter} for All Cryptocurrencies')
 st.pyplot(plt)
 
 # Display Top 3 and Worst 3 Performers
-top_performers = grouped_data.nlargest(3)
-worst_performers = grouped_data.nsmallest(3)
+top_performers, worst_performers = top_and_worst(grouped_data)
 
 st.subheader('Top 3 Performers')
 st.table(top_performers)
@@ -1,16 +1,17 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
+from cryptodash.analytics import compare, extreme_moves, filter_window, price_table, top_and_worst
+from cryptodash.data_service import DataService
+from cryptodash.formatting import ranked_table
 
 # Load Data
-@st.cache_data
-def load_data():
-    data = pd.read_csv('data.csv', parse_dates=['Date'])
-    return data
+# One read-only copy per process, shared by every session; the
+# percent-change columns are computed once when it is built
+@st.cache_resource
+def load_service():
+    return DataService('data.csv')
 
-data = load_data()
+service = load_service()
+data = service.data
 
 # Custom formatting function for y-axis labels
 def format_y_labels(x, pos):
@@ -51,25 +52,9 @@ end_date = st.sidebar.date_input("End Date", data['Date'].max())
 st.sidebar.markdown("### Time Frame for Percent Change")
 time_frame = st.sidebar.selectbox("Select Time Frame", ["1 month", "7 days", "24 hours"])
 
-# Convert start_date and end_date to Timestamp objects
-start_date = pd.Timestamp(start_date)
-end_date = pd.Timestamp(end_date)
-
 # Filter data based on selected time frame and cryptocurrency
-if selected_crypto == 'All':
-    if time_frame == "1 month":
-        filtered_data = data[(data['Date'] >= start_date - pd.DateOffset(months=1)) & (data['Date'] <= end_date)]
-    elif time_frame == "7 days":
-        filtered_data = data[(data['Date'] >= start_date - pd.DateOffset(days=7)) & (data['Date'] <= end_date)]
-    elif time_frame == "24 hours":
-        filtered_data = data[(data['Date'] >= start_date - pd.DateOffset(hours=24)) & (data['Date'] <= end_date)]
-else:
-    if time_frame == "1 month":
-        filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(months=1)) & (data['Date'] <= end_date)]
-    elif time_frame == "7 days":
-        filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(days=7)) & (data['Date'] <= end_date)]
-    elif time_frame == "24 hours":
-        filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(hours=24)) & (data['Date'] <= end_date)]
+crypto = None if selected_crypto == 'All' else selected_crypto
+filtered_data, _ = filter_window(service, crypto, start_date, end_date, time_frame)
 
 
 # Title
@@ -77,30 +62,14 @@ else:
 # Table with selected data
 st.subheader('Cryptocurrency Prices by Market Cap')
 
-# Calculate percentage changes for 1h and 24h
-filtered_data['1h (%)'] = (filtered_data['High'] - filtered_data['Low']) / filtered_data['Low'] * 100
-filtered_data['24h (%)'] = (filtered_data['Close'] - filtered_data['Open']) / filtered_data['Open'] * 100
-
-# Format values in million (M) and billion (B) USD
-def format_value(value):
-    if value >= 1e9:
-        return f'{value/1e9:.2f}B USD'
-    elif value >= 1e6:
-        return f'{value/1e6:.2f}M USD'
-    else:
-        return f'{value:.2f} USD'
+# First rows with volume and market cap in million (M) and billion (B) USD
+st.table(price_table(filtered_data))
 
-# Round off volume and market cap values
-table_data = filtered_data.head(10)[['Name', 'Close', '1h (%)', '24h (%)', 'Volume', 'Marketcap']]
-table_data['Volume'] = table_data['Volume'].apply(lambda x: format_value(round(x, 2)))
-table_data['Marketcap'] = table_data['Marketcap'].apply(format_value)
 
-st.table(table_data)
 
-
-
-# Calculate 7-day percentage change
-filtered_data['7d (%)'] = (filtered_data['Close'] - filtered_data['Open'].shift(7)) / filtered_data['Open'].shift(7) * 100
+# Plotting libraries are loaded when the first chart renders
+import plotly.express as px
+import plotly.graph_objects as go
 
 # Create a line chart for 7-day percentage change
 fig = px.line(filtered_data, x='Date', y='7d (%)', title='7-Day Percentage Change')
@@ -192,7 +161,6 @@ st.plotly_chart(fig)
 
 
 # Price Changes
-filtered_data['Price Change (%)'] = ((filtered_data['Close'] - filtered_data['Open']) / filtered_data['Open']) * 100
 
 st.subheader('Price Changes (%)')
 fig = px.bar(filtered_data, x='Date', y='Price Change (%)', title='Price Change (%) in USD', color='Price Change (%)', color_continuous_scale='RdBu')
@@ -204,10 +172,9 @@ st.plotly_chart(fig)
 
 # Extreme Price Movements
 st.subheader('Extreme Price Movements')
-max_price_increase = filtered_data['Price Change (%)'].idxmax()
-max_price_decrease = filtered_data['Price Change (%)'].idxmin()
-st.write(f"Day with Largest Increase: {filtered_data.loc[max_price_increase, 'Date']} ({filtered_data.loc[max_price_increase, 'Price Change (%)']:.2f}%)")
-st.write(f"Day with Largest Decrease: {filtered_data.loc[max_price_decrease, 'Date']} ({filtered_data.loc[max_price_decrease, 'Price Change (%)']:.2f}%)")
+extremes = extreme_moves(filtered_data)
+st.write(f"Day with Largest Increase: {extremes['Largest Increase Date']} ({extremes['Largest Increase (%)']:.2f}%)")
+st.write(f"Day with Largest Decrease: {extremes['Largest Decrease Date']} ({extremes['Largest Decrease (%)']:.2f}%)")
 
 
 # Compare Performance of All Cryptocurrencies
@@ -216,8 +183,8 @@ st.subheader('Compare Performance of All Cryptocurrencies')
 # Initialize comparison_parameter
 comparison_parameter = st.selectbox("Select Parameter to Compare", ["Volume", "Marketcap", "High", "Low"])
 
-# Group data by cryptocurrency and calculate the mean for the selected parameter
-grouped_data = data.groupby('Name')[comparison_parameter].mean().sort_values()
+# Mean of the selected parameter per cryptocurrency, from the precomputed cube
+grouped_data = compare(service, comparison_parameter)
 
 # Create a bar chart to visualize the performance
 fig = px.bar(
@@ -248,20 +215,12 @@ st.plotly_chart(fig)
 
 
 # Display Top 3 and Worst 3 Performers
-top_performers = grouped_data.nlargest(3)
-worst_performers = grouped_data.nsmallest(3)
+top_performers, worst_performers = top_and_worst(grouped_data)
+performers_title = f'Historical Market Trends ({comparison_parameter})'
 
 st.subheader('Top 3 Performers')
-top_performers_table = top_performers.reset_index()  # Reset index to include "Name" as a column
-top_performers_table.index = range(1, len(top_performers_table) + 1)  # Set index as 1, 2, 3...
-top_performers_table = top_performers_table.rename(columns={comparison_parameter: f'Historical Market Trends ({comparison_parameter})', 'index': 'S.No.'})
-top_performers_table[f'Historical Market Trends ({comparison_parameter})'] = top_performers_table[f'Historical Market Trends ({comparison_parameter})'].apply(lambda x: f'{x/1e9:.3g}B USD' if x >= 1e9 else f'{x/1e6:.3g}M USD')
-st.table(top_performers_table)
+st.table(ranked_table(top_performers, performers_title, significant=3, min_scale=1e6))
 
 st.subheader('Worst 3 Performers')
-worst_performers_table = worst_performers.reset_index()  # Reset index to include "Name" as a column
-worst_performers_table.index = range(1, len(worst_performers_table) + 1)  # Set index as 1, 2, 3...
-worst_performers_table = worst_performers_table.rename(columns={comparison_parameter: f'Historical Market Trends ({comparison_parameter})', 'index': 'S.No.'})
-worst_performers_table[f'Historical Market Trends ({comparison_parameter})'] = worst_performers_table[f'Historical Market Trends ({comparison_parameter})'].apply(lambda x: f'{x/1e9:.3g}B USD' if x >= 1e9 else f'{x/1e6:.3g}M USD')
-st.table(worst_performers_table)
+st.table(ranked_table(worst_performers, performers_title, significant=3, min_scale=1e6))
 
@@ -1,8 +1,20 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
+from cryptodash.analytics import compare, extreme_moves, filter_window, intraday_window, price_table, top_and_worst
+from cryptodash.data_service import DataService
+from cryptodash.ingest import Ingestor, YFinanceFeed
+from cryptodash.charts import (FigureCache, candlestick_figure, comparison_figure, historical_performance_figure,
+                    market_cap_figure, price_change_figure, seven_day_change_figure)
+from cryptodash.resample import FREQUENCIES
+from cryptodash.formatting import ranked_table
+from cryptodash.backtest import STRATEGIES, evaluate, price_matrix, run
+from cryptodash.instrumentation import Profiler
+from cryptodash.partitions import MANIFEST as BARS_MANIFEST, PartitionedStore
+from cryptodash.live import LiveFeed, ReplayFeed, chart_rows
+from cryptodash.alerts import AlertEngine, ma_cross, move, volume_spike
+from cryptodash.jobs import ResultStore
+import os
+import time
 
 
 
@@ -26,16 +38,50 @@ body {
 """
 st.markdown(custom_css, unsafe_allow_html=True)
 
+# Timings of every section of this run, shown in the sidebar at the end
+perf = Profiler()
+
 
 
 
 # Load Data
-@st.cache_data
-def load_data():
-    data = pd.read_csv('data.csv', parse_dates=['Date'])
-    return data
+# One read-only copy per process, shared by every session instead of
+# unpickling a private DataFrame for each caller
+@st.cache_resource
+def load_service():
+    return DataService('data.csv')
+
+with perf.stage('load') as stage:
+    service = load_service()
+    stage.rows = len(service.data)
+
+# Built figures shared by all sessions, keyed on their inputs
+@st.cache_resource
+def load_figure_cache():
+    return FigureCache(maxsize=256)
+
+figures = load_figure_cache()
+
+# Hourly/minute bars imported with `python -m cryptodash.partitions`, if any
+BARS_ROOT = os.environ.get('CRYPTODASH_BARS', 'bars')
 
-data = load_data()
+@st.cache_resource
+def load_bars():
+    if os.path.exists(os.path.join(BARS_ROOT, BARS_MANIFEST)):
+        return PartitionedStore(BARS_ROOT)
+    return None
+
+bars_store = load_bars()
+
+# Append candles newer than the last stored date to the shared dataset
+if st.sidebar.button("Fetch Latest Prices"):
+    try:
+        new_rows = Ingestor(service, YFinanceFeed()).run()
+        st.sidebar.success(f"Added {len(new_rows)} new rows")
+    except Exception as e:
+        st.sidebar.error(f"Could not fetch new prices: {e}")
+
+data = service.data
 
 # Custom formatting function for y-axis labels
 def format_y_labels(x, pos):
@@ -106,25 +152,23 @@ end_date = st.sidebar.date_input("End Date", data['Date'].max())
 st.sidebar.markdown("### Time Frame for Percent Change")
 time_frame = st.sidebar.selectbox("Select Time Frame", ["1 month", "7 days", "24 hours"])
 
-# Convert start_date and end_date to Timestamp objects
-start_date = pd.Timestamp(start_date)
-end_date = pd.Timestamp(end_date)
+# Candle Interval Selector
+st.sidebar.markdown("### Candle Interval")
+candle_interval = st.sidebar.selectbox("Select Candle Interval", list(FREQUENCIES))
+
+# Live Mode: replays the last months of data.csv as ticks
+st.sidebar.markdown("### Live Mode")
+live_mode = st.sidebar.checkbox("Stream Live Prices")
 
 # Filter data based on selected time frame and cryptocurrency
-if selected_crypto == 'All':
-    if time_frame == "1 month":
-        filtered_data = data[(data['Date'] >= start_date - pd.DateOffset(months=1)) & (data['Date'] <= end_date)]
-    elif time_frame == "7 days":
-        filtered_data = data[(data['Date'] >= start_date - pd.DateOffset(days=7)) & (data['Date'] <= end_date)]
-    elif time_frame == "24 hours":
-        filtered_data = data[(data['Date'] >= start_date - pd.DateOffset(hours=24)) & (data['Date'] <= end_date)]
-else:
-    if time_frame == "1 month":
-        filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(months=1)) & (data['Date'] <= end_date)]
-    elif time_frame == "7 days":
-        filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(days=7)) & (data['Date'] <= end_date)]
-    elif time_frame == "24 hours":
-        filtered_data = data[(data['Name'] == selected_crypto) & (data['Date'] >= start_date - pd.DateOffset(hours=24)) & (data['Date'] <= end_date)]
+crypto = None if selected_crypto == 'All' else selected_crypto
+end_date = pd.Timestamp(end_date)
+with perf.stage('filter') as stage:
+    filtered_data, window_start = filter_window(service, crypto, start_date, end_date, time_frame)
+    stage.rows = len(filtered_data)
+
+# Everything the time-series charts depend on; figures are rebuilt only when it changes
+filter_key = (crypto, window_start, end_date, service.version)
 
 # Additional Educational Resources Section
 st.sidebar.markdown("## Educational Resources")
@@ -153,56 +197,21 @@ st.sidebar.markdown("- [Introduction to Stablecoins](https://www.investopedia.co
 # Table with selected data
 st.subheader('Cryptocurrency Prices Data')
 
-# Calculate percentage changes for 1h and 24h
-filtered_data['1h (%)'] = (filtered_data['High'] - filtered_data['Low']) / filtered_data['Low'] * 100
-filtered_data['24h (%)'] = (filtered_data['Close'] - filtered_data['Open']) / filtered_data['Open'] * 100
-
-# Format values in million (M) and billion (B) USD
-def format_value(value):
-    if value >= 1e9:
-        return f'{value/1e9:.2f}B USD'
-    elif value >= 1e6:
-        return f'{value/1e6:.2f}M USD'
-    else:
-        return f'{value:.2f} USD'
-
-# Round off volume and market cap values
-table_data = filtered_data.head(10)[['Name', 'Close', '1h (%)', '24h (%)', 'Volume', 'Marketcap']]
-table_data['Volume'] = table_data['Volume'].apply(lambda x: format_value(round(x, 2)))
-table_data['Marketcap'] = table_data['Marketcap'].apply(format_value)
-
-st.table(table_data)
-
-
-
-# Calculate 7-day percentage change
-
-filtered_data['7d (%)'] = (filtered_data['Close'] - filtered_data['Open'].shift(7)) / filtered_data['Open'].shift(7) * 100
-
-# Create a line chart for 7-day percentage change
-fig = px.line(filtered_data, x='Date', y='7d (%)', title='7-Day Percentage Change')
-
-# Custom line and marker styling
-fig.update_traces(
-    line=dict(width=2, color='royalblue'),
-    marker=dict(size=8, color='royalblue', line=dict(width=2, color='white'))
-)
-
-# Customize the layout
-fig.update_layout(
-    xaxis_title='Date',
-    yaxis_title='7-Day Percentage Change (%)',
-    title_x=0.5,
-    height=500,
-    margin=dict(l=50, r=50, t=50, b=50),
-    plot_bgcolor='rgba(0,0,0,0)',  # Transparent plot background
-    paper_bgcolor='rgba(0,0,0,0.05)',  # Light gray paper background
-    font=dict(family='Arial', size=12, color='black')
-)
-
-# Remove gridlines
-fig.update_xaxes(showgrid=False)
-fig.update_yaxes(showgrid=False)
+# Format volume and market cap values in million (M) and billion (B) USD
+with perf.stage('table') as stage:
+    table_data = price_table(filtered_data)
+    st.table(stage.sent(table_data))
+
+# Intraday bars for the selected time frame, read only from the partitions it overlaps
+if bars_store is not None and crypto in bars_store.names:
+    st.subheader('Intraday Prices')
+    with perf.stage('intraday') as stage:
+        intraday = intraday_window(bars_store, crypto, window_start, end_date + pd.Timedelta(days=1))
+        stage.rows = len(intraday)
+    if len(intraday):
+        latest = intraday.iloc[-1]
+        st.write(f"1h change: {latest['1h (%)']:.2f}% | 24h change: {latest['24h (%)']:.2f}% (at {latest['Date']})")
+        st.line_chart(stage.sent(intraday.set_index('Date')[['Close']]))
 
 # Display the Plotly figure using Streamlit
 st.subheader('7-Day Percentage Change')
@@ -212,7 +221,10 @@ with st.expander("What is 7-Day Percentage Change?"):
     st.markdown("- _This metric helps traders and investors assess short-term price movements and volatility._")
     st.markdown("- _Understanding 7-day percentage change can aid in identifying short-term trends and potential trading opportunities._")
 
-st.plotly_chart(fig)
+with perf.stage('7d chart') as stage:
+    # Create a line chart for 7-day percentage change
+    fig = figures.get(('7d',) + filter_key, lambda: seven_day_change_figure(filtered_data))
+    st.plotly_chart(stage.sent(fig, rows=len(filtered_data)))
 
 # Volume Trends
 st.subheader('Volume Trends')
@@ -224,23 +236,15 @@ with st.expander("What is Volume Trends?"):
     st.markdown("- _Understanding volume trends helps investors make informed decisions and predict market movements._")
 
 st.markdown("Chart showing the volume trends over time.")
-# Create Candlestick Chart for Volume Trends
-fig = go.Figure(data=[go.Candlestick(x=filtered_data['Date'],
-                open=filtered_data['Open'],
-                high=filtered_data['High'],
-                low=filtered_data['Low'],
-                close=filtered_data['Close'])])
-
-fig.update_layout(
-    title_text='Volume Trends',
-    yaxis_title='Prices in USD',
-    xaxis_title='Date',
-    showlegend=False
-)
+# Create Candlestick Chart for Volume Trends, aggregated to the selected interval
+def build_candlestick():
+    candles = service.bars(crypto, FREQUENCIES[candle_interval], window_start, end_date)
+    return candlestick_figure(candles)
 
-st.plotly_chart(fig)
+with perf.stage('candlestick chart') as stage:
+    fig = figures.get(('candlestick', candle_interval) + filter_key, build_candlestick)
+    st.plotly_chart(stage.sent(fig, rows=len(filtered_data)))
 
-import plotly.graph_objects as go
 
 # Market Capitalization Trends
 st.subheader('Market Capitalization Trends Over Time')
@@ -250,18 +254,9 @@ with st.expander("What is Market Trends?"):
    st.markdown("- _Analyzing market trends helps investors identify patterns and make predictions about future price movements._")
    st.markdown("- _Traders use various technical analysis tools to interpret market trends and make trading decisions._")
 
-
-fig = px.line(filtered_data, x='Date', y='Marketcap', title='Market Capitalization Trends',
-              labels={'Marketcap': 'Market Capitalization (USD)', 'Date': 'Date'})
-
-fig.update_layout(
-    yaxis_title='Market Capitalization (USD)',
-    xaxis=dict(showline=True, showgrid=False),
-    yaxis=dict(showline=True, showgrid=True, gridcolor='lightgrey'),
-    showlegend=False
-)
-
-st.plotly_chart(fig)
+with perf.stage('market cap chart') as stage:
+    fig = figures.get(('marketcap',) + filter_key, lambda: market_cap_figure(filtered_data))
+    st.plotly_chart(stage.sent(fig, rows=len(filtered_data)))
 
 # Historical Performance
 st.subheader('Historical Performance')
@@ -274,19 +269,11 @@ with st.expander("What is Historical Performance?"):
 
 st.markdown("Chart showing the historical performance trends over time.")
 
-# Create a figure using Plotly Express
-fig = px.area(filtered_data, x='Date', y=['Open', 'High', 'Low', 'Close'],
-              labels={'variable': 'Price Type', 'value': 'Price (USD)', 'Date': 'Date'},
-              title='Historical Market Trends',
-              color_discrete_map={'Open': 'blue', 'High': 'green', 'Low': 'red', 'Close': 'purple'})
+with perf.stage('historical chart') as stage:
+    fig = figures.get(('historical',) + filter_key, lambda: historical_performance_figure(filtered_data))
 
-# Add customizations to the figure
-fig.update_xaxes(title_text='Date')
-fig.update_yaxes(title_text='Prices in USD')
-fig.update_layout(legend_title_text='Price Type')
-
-# Display the Plotly figure using Streamlit
-st.plotly_chart(fig)
+    # Display the Plotly figure using Streamlit
+    st.plotly_chart(stage.sent(fig, rows=len(filtered_data)))
 
 
 
@@ -300,14 +287,9 @@ with st.expander("What is Price Change?"):
      st.markdown("- _Price change is an important metric for short-term traders and investors looking to capitalize on price movements._")
      st.markdown("- _Understanding price change patterns can help investors time their entries and exits for optimal gains._")
 
-filtered_data['Price Change (%)'] = ((filtered_data['Close'] - filtered_data['Open']) / filtered_data['Open']) * 100
-
-fig = px.bar(filtered_data, x='Date', y='Price Change (%)', title='Price Change (%) in USD', color='Price Change (%)', color_continuous_scale='RdBu')
-
-fig.update_yaxes(title_text='Price Change (%) in USD')  # Add title to y-axis
-fig.update_layout(showlegend=False)  # Remove legend
-
-st.plotly_chart(fig)
+with perf.stage('price change chart') as stage:
+    fig = figures.get(('price_change',) + filter_key, lambda: price_change_figure(filtered_data))
+    st.plotly_chart(stage.sent(fig, rows=len(filtered_data)))
 
 # Extreme Price Movements
 st.subheader('Extreme Price Movements')
@@ -319,10 +301,11 @@ with st.expander("What is Extreme Price Movements?"):
     st.markdown("- _Traders and investors often monitor extreme price movements to gauge market dynamics and potential opportunities._")
     st.markdown("- _It's important to note that extreme price movements can carry higher risks due to increased volatility._")
 
-max_price_increase = filtered_data['Price Change (%)'].idxmax()
-max_price_decrease = filtered_data['Price Change (%)'].idxmin()
-st.write(f"Day with Largest Increase: {filtered_data.loc[max_price_increase, 'Date']} ({filtered_data.loc[max_price_increase, 'Price Change (%)']:.2f}%)")
-st.write(f"Day with Largest Decrease: {filtered_data.loc[max_price_decrease, 'Date']} ({filtered_data.loc[max_price_decrease, 'Price Change (%)']:.2f}%)")
+with perf.stage('extremes') as stage:
+    extremes = extreme_moves(filtered_data)
+    stage.rows = len(filtered_data)
+    st.write(f"Day with Largest Increase: {extremes['Largest Increase Date']} ({extremes['Largest Increase (%)']:.2f}%)")
+    st.write(f"Day with Largest Decrease: {extremes['Largest Decrease Date']} ({extremes['Largest Decrease (%)']:.2f}%)")
 
 
 # Compare Performance of All Cryptocurrencies
@@ -331,54 +314,117 @@ st.subheader('Compare Performance of All Cryptocurrencies')
 # Initialize comparison_parameter
 comparison_parameter = st.selectbox("Select Parameter to Compare", ["Volume", "Marketcap", "High", "Low"])
 
-# Group data by cryptocurrency and calculate the mean for the selected parameter
-grouped_data = data.groupby('Name')[comparison_parameter].mean().sort_values()
-
-# Create a bar chart to visualize the performance
-fig = px.bar(
-    grouped_data, 
-    x=comparison_parameter, 
-    y=grouped_data.index, 
-    orientation='h',
-    labels={comparison_parameter: f'{comparison_parameter} (USD)', 'index': 'Cryptocurrency'},
-    title=f'Average {comparison_parameter} for All Cryptocurrencies',
-    color=grouped_data.values,  # Add color to the bars
-    color_continuous_scale='Inferno',  # Choose a color scale
-    text=grouped_data.values.round(2),  # Display data values on the bars
-)
-
-# Customize the layout
-fig.update_layout(
-    xaxis_title=f'{comparison_parameter} (USD)',  # X-axis title
-    yaxis_title='Cryptocurrency',  # Y-axis title
-    showlegend=False,  # Remove legend
-    plot_bgcolor='rgba(0, 0, 0, 0)',  # Transparent plot background
-    paper_bgcolor='black',  # Dark background
-    font=dict(color='white'),  # Font color
-)
-
-# Display the Plotly figure using Streamlit
-st.plotly_chart(fig)
-
-
+with perf.stage('comparison') as stage:
+    # Mean of the selected parameter per cryptocurrency, looked up from the precomputed cube
+    grouped_data = compare(service, comparison_parameter)
 
-# Display Top 3 and Worst 3 Performers
-top_performers = grouped_data.nlargest(3)
-worst_performers = grouped_data.nsmallest(3)
+    # Create a bar chart to visualize the performance
+    fig = figures.get(('comparison', comparison_parameter, service.version),
+                      lambda: comparison_figure(grouped_data, comparison_parameter))
 
-st.subheader('Top 3 Performers')
-top_performers_table = top_performers.reset_index()  # Reset index to include "Name" as a column
-top_performers_table.index = range(1, len(top_performers_table) + 1)  # Set index as 1, 2, 3...
-top_performers_table = top_performers_table.rename(columns={comparison_parameter: f'Historical Market Trends ({comparison_parameter})', 'index': 'S.No.'})
-top_performers_table[f'Historical Market Trends ({comparison_parameter})'] = top_performers_table[f'Historical Market Trends ({comparison_parameter})'].apply(lambda x: f'{x/1e9:.3g}B USD' if x >= 1e9 else f'{x/1e6:.3g}M USD')
-st.table(top_performers_table)
-
-st.subheader('Worst 3 Performers')
-worst_performers_table = worst_performers.reset_index()  # Reset index to include "Name" as a column
-worst_performers_table.index = range(1, len(worst_performers_table) + 1)  # Set index as 1, 2, 3...
-worst_performers_table = worst_performers_table.rename(columns={comparison_parameter: f'Historical Market Trends ({comparison_parameter})', 'index': 'S.No.'})
-worst_performers_table[f'Historical Market Trends ({comparison_parameter})'] = worst_performers_table[f'Historical Market Trends ({comparison_parameter})'].apply(lambda x: f'{x/1e9:.3g}B USD' if x >= 1e9 else f'{x/1e6:.3g}M USD')
-st.table(worst_performers_table)
+    # Display the Plotly figure using Streamlit
+    st.plotly_chart(stage.sent(fig, rows=len(grouped_data)))
 
 
 
+# Display Top 3 and Worst 3 Performers
+top_performers, worst_performers = top_and_worst(grouped_data)
+performers_title = f'Historical Market Trends ({comparison_parameter})'
+
+with perf.stage('performers') as stage:
+    st.subheader('Top 3 Performers')
+    top_performers_table = ranked_table(top_performers, performers_title, significant=3, min_scale=1e6)
+    st.table(stage.sent(top_performers_table))
+
+    st.subheader('Worst 3 Performers')
+    worst_performers_table = ranked_table(worst_performers, performers_title, significant=3, min_scale=1e6)
+    st.table(stage.sent(worst_performers_table))
+
+
+# Backtest a strategy on the historical closes
+st.subheader('Backtest a Strategy')
+
+# Close prices as a dates x coins matrix, rebuilt only when the data changes
+@st.cache_resource
+def load_prices(version):
+    return price_matrix(service.data)
+
+prices = load_prices(service.version)
+backtest_coins = st.multiselect("Coins", list(prices.columns), default=list(prices.columns[:3]))
+strategy = st.selectbox("Strategy", list(STRATEGIES))
+params = {}
+if strategy in ('rebalance', 'dca'):
+    params['period'] = st.slider("Period (days)", 7, 365, 30)
+elif strategy == 'ma_crossover':
+    params['fast'] = st.slider("Fast SMA (days)", 5, 100, 20)
+    params['slow'] = st.slider("Slow SMA (days)", 10, 300, 50)
+
+if backtest_coins:
+    with perf.stage('backtest') as stage:
+        equity = run(prices, strategy, tuple(backtest_coins), **params)
+        st.line_chart(equity)
+        stage.rows = len(equity)
+    results = evaluate(equity.to_numpy(), equity.index)
+    st.write(f"CAGR: {results['CAGR']:.2%} | Max Drawdown: {results['Max Drawdown']:.2%} | Sharpe: {results['Sharpe']:.2f}")
+
+
+# Section timings of this run; set CRYPTODASH_PROMETHEUS_FILE or
+# CRYPTODASH_PERF_LOG to also export them
+with st.sidebar.expander("Performance"):
+    st.write(f"Total: {perf.total_seconds() * 1000:.1f} ms")
+    st.dataframe(perf.to_frame())
+    st.write(f"Figure cache: {figures.hits} hits, {figures.misses} misses")
+if os.environ.get('CRYPTODASH_PROMETHEUS_FILE'):
+    perf.export_prometheus(os.environ['CRYPTODASH_PROMETHEUS_FILE'])
+if os.environ.get('CRYPTODASH_PERF_LOG'):
+    perf.export_jsonl(os.environ['CRYPTODASH_PERF_LOG'])
+
+
+# Live prices. The feed is consumed on a background thread; this loop only
+# appends the new rows to charts created once, so neither the script nor
+# the figures are rebuilt while it runs. It must stay last in the script.
+if live_mode:
+    st.header("Live Prices")
+    live_coins = st.multiselect("Live Coins", list(crypto_list), default=list(crypto_list[:5]))
+    refresh = st.slider("Refresh (seconds)", 0.5, 5.0, 1.0)
+
+    # Alert rules, checked on every coin as each candle completes
+    st.sidebar.markdown("### Alerts")
+    alert_move = st.sidebar.number_input("Daily move above (%)", 1.0, 100.0, 10.0)
+    alert_ma = st.sidebar.number_input("Close crosses SMA (days)", 5, 200, 50)
+    alert_volume = st.sidebar.number_input("Volume above k x 30-day average", 1.0, 20.0, 3.0)
+    rules = [move(alert_move), ma_cross(alert_ma), volume_spike(alert_volume)]
+
+    # One feed and alert engine per session; changing a rule only recompiles
+    # the engine, whose state is deep enough for the longest allowed window
+    if 'live' not in st.session_state:
+        replay_start = data['Date'].max() - pd.DateOffset(months=6)
+        engine = AlertEngine(rules, sink=ResultStore(), depth=200)
+        engine.warm(data[data['Date'] < replay_start])
+        live = LiveFeed(ReplayFeed(data, delay=0.5, start=replay_start))
+        live.subscribers.append(engine.update)
+        st.session_state['live'], st.session_state['alert_engine'] = live.start(), engine
+    live, engine = st.session_state['live'], st.session_state['alert_engine']
+    if [rule.name for rule in engine.rules] != [rule.name for rule in rules]:
+        engine.set_rules(rules)
+    alert_log = engine.sink
+    live_chart = st.line_chart(pd.DataFrame(columns=live_coins, dtype=float))
+    open_candles = st.empty()
+    st.subheader("Alerts")
+    alert_table = st.empty()
+    while True:
+        time.sleep(refresh)
+        completed, current = live.drain()
+        if live.error is not None:
+            st.error(f"Live feed stopped: {live.error}")
+            break
+        if len(completed):
+            live_chart.add_rows(chart_rows(completed, live_coins))
+        if len(current):
+            open_candles.dataframe(current[current['Name'].isin(live_coins)], use_container_width=True)
+        if len(completed):
+            alert_table.dataframe(pd.DataFrame(alert_log.rows[-20:][::-1]), use_container_width=True)
+elif 'live' in st.session_state:
+    # Live mode switched off: stop this session's feed
+    st.session_state.pop('live').stop()
+    st.session_state.pop('alert_engine')
@@ -0,0 +1,4 @@
+"""Data loading and analytics behind the cryptocurrency dashboards."""
+from .analytics import compare, extreme_moves, filter_window, price_table, top_and_worst
+from .data_service import DataService
+from .data_store import read_data
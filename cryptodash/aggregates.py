@@ -0,0 +1,64 @@
+import pandas as pd
+
+# Columns and statistics kept in the cube
+CUBE_COLUMNS = ['Volume', 'Marketcap', 'High', 'Low', 'Close', 'Price Change (%)']
+STATS = ['mean', 'min', 'max', 'last', 'sum']
+
+# How the stored partial aggregates of several cells combine
+COMBINE = {'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max', 'last': 'last'}
+
+
+def build_cells(data, freq):
+    """Partial aggregates per (Name, period) for every cube column."""
+    periods = data['Date'].dt.to_period(freq).dt.start_time.rename('Date')
+    grouped = data.groupby([data['Name'], periods], sort=False, observed=True)[CUBE_COLUMNS]
+    return grouped.agg(list(COMBINE))
+
+
+def combine_cells(cells):
+    """Fold cells into one row per coin."""
+    return cells.groupby(level='Name', sort=False, observed=True).agg(
+        {(column, stat): how for column in CUBE_COLUMNS for stat, how in COMBINE.items()})
+
+
+class AggregateCube:
+    """Per-coin mean/min/max/last/sum of the comparison columns.
+
+    The data is aggregated once into cells of ``freq`` periods (monthly by
+    default); whole-history figures are folded from those cells up front,
+    and date-bounded ones from the cells that fall inside the range, so a
+    comparison never scans the daily rows.
+    """
+
+    def __init__(self, data, freq='M'):
+        self.freq = freq
+        self.cells = build_cells(data, freq)
+        self.totals = combine_cells(self.cells)
+
+    def update(self, data):
+        """Recompute the cells of the coins present in ``data`` (their full history)."""
+        names = data['Name'].unique()
+        kept = self.cells[~self.cells.index.get_level_values('Name').isin(names)]
+        self.cells = pd.concat([kept, build_cells(data, self.freq)])
+        self.totals = combine_cells(self.cells)
+
+    def lookup(self, column, stat='mean', start=None, end=None):
+        """Series of ``stat`` of ``column`` per coin.
+
+        With ``start``/``end`` every period overlapping the range counts, so
+        the bounds are widened to whole periods.
+        """
+        table = self.totals
+        if start is not None or end is not None:
+            dates = self.cells.index.get_level_values('Date')
+            keep = pd.Series(True, index=self.cells.index)
+            if start is not None:
+                keep &= dates >= pd.Timestamp(start).to_period(self.freq).start_time
+            if end is not None:
+                keep &= dates <= pd.Timestamp(end)
+            table = combine_cells(self.cells[keep.to_numpy()])
+        if stat == 'mean':
+            values = table[(column, 'sum')] / table[(column, 'count')]
+        else:
+            values = table[(column, stat)]
+        return values.rename(column)
@@ -0,0 +1,225 @@
+"""Threshold alerts evaluated on every coin as candles arrive.
+
+Three kinds of rule::
+
+    move(5)               |Close change from the previous candle| > 5%
+    ma_cross(50)          Close crosses its 50-candle SMA
+    volume_spike(3, 30)   Volume > 3 x the average of the previous 30
+
+:class:`AlertEngine` compiles the registered rules into one table per
+kind: thresholds sorted so a candle finds every rule it triggers with one
+``searchsorted``, and rules grouped by window so each distinct window is
+computed once. Per coin it keeps only a ring buffer of the last few
+closes and volumes, so an update costs the new candles times the distinct
+windows, whatever the history length or the number of rules. Each alert
+goes to a sink with an ``add(row)`` method, e.g. :class:`jobs.ResultStore`,
+which keeps them in memory and optionally appends them to a JSON lines
+file. An engine can subscribe to a :class:`live.LiveFeed`::
+
+    engine = AlertEngine([move(10), ma_cross(50)], sink=ResultStore('alerts.jsonl'))
+    engine.warm(service.data)
+    live.subscribers.append(engine.update)
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+ALERT_COLUMNS = ['Rule', 'Name', 'Date', 'Value']
+
+
+class Rule:
+    def __init__(self, kind, name, threshold=None, window=None):
+        self.kind = kind
+        self.name = name
+        self.threshold = threshold
+        self.window = window
+
+    def __repr__(self):
+        return f'Rule({self.name!r})'
+
+
+def move(percent):
+    """Close moved more than ``percent`` % from the previous candle, up or down."""
+    return Rule('move', f'move > {percent}%', threshold=float(percent))
+
+
+def ma_cross(window):
+    """Close crossed its ``window``-candle simple moving average."""
+    return Rule('cross', f'Close crosses SMA {window}', window=int(window))
+
+
+def volume_spike(k, window=30):
+    """Volume above ``k`` times the average volume of the previous ``window`` candles."""
+    return Rule('volume', f'Volume > {k} x {window}-day average', threshold=float(k), window=int(window))
+
+
+def fired_pairs(values, thresholds):
+    """``(candle, rule)`` positions where ``values`` exceed the sorted ``thresholds``.
+
+    Rules are sorted by threshold, so the rules a candle triggers are a
+    prefix; the work is one ``searchsorted`` per candle plus one step per
+    alert.
+    """
+    counts = np.searchsorted(thresholds, values, side='left')
+    counts[np.isnan(values)] = 0
+    candles = np.repeat(np.arange(len(values)), counts)
+    rules = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return candles, rules
+
+
+class AlertEngine:
+    """Registered rules plus the per-coin state needed to evaluate them.
+
+    ``depth`` is how many candles of each coin are kept; rules need a
+    window no longer than ``depth`` (``depth - 1`` for volume averages).
+    It defaults to what the initial rules need.
+    """
+
+    def __init__(self, rules=(), sink=None, depth=None):
+        rules = list(rules)
+        windows = [rule.window + (rule.kind == 'volume') for rule in rules if rule.window]
+        self.depth = depth or max(windows + [2])
+        self.sink = sink
+        self.rules = []
+        self.names = pd.Index([], dtype=object)
+        self.closes = np.empty((0, self.depth))
+        self.volumes = np.empty((0, self.depth))
+        # Candles seen per coin; the next one goes to column count % depth
+        self.count = np.empty(0, dtype=np.int64)
+        # Close minus SMA of each coin at its last candle, per cross window
+        self.gaps = {}
+        self._lock = threading.Lock()
+        for rule in rules:
+            self.register(rule)
+
+    def check(self, rule):
+        needed = rule.window + (rule.kind == 'volume') if rule.window else 2
+        if needed > self.depth:
+            raise ValueError(f'{rule.name} needs {needed} candles of state, the engine keeps {self.depth}')
+
+    def register(self, rule):
+        self.check(rule)
+        with self._lock:
+            self.rules.append(rule)
+            self.compile()
+        return rule
+
+    def set_rules(self, rules):
+        """Replace the registered rules, keeping the per-coin state."""
+        rules = list(rules)
+        for rule in rules:
+            self.check(rule)
+        with self._lock:
+            self.rules = rules
+            self.compile()
+
+    def compile(self):
+        """Group the rules into per-kind threshold tables."""
+        def table(ids):
+            ids = np.array(sorted(ids, key=lambda i: self.rules[i].threshold), dtype=np.int64)
+            return np.array([self.rules[i].threshold for i in ids]), ids
+
+        self.labels = np.array([rule.name for rule in self.rules], dtype=object)
+        windows = {rule.window for rule in self.rules if rule.kind == 'cross'}
+        self.gaps = {window: self.gaps[window] if window in self.gaps else self.last_gaps(window)
+                     for window in windows}
+        self.moves = table([i for i, rule in enumerate(self.rules) if rule.kind == 'move'])
+        self.crosses = {}
+        self.spikes = {}
+        for i, rule in enumerate(self.rules):
+            if rule.kind == 'cross':
+                self.crosses.setdefault(rule.window, []).append(i)
+        for window in {rule.window for rule in self.rules if rule.kind == 'volume'}:
+            self.spikes[window] = table([i for i, rule in enumerate(self.rules)
+                                         if rule.kind == 'volume' and rule.window == window])
+
+    def last_gaps(self, window):
+        """Close minus SMA ``window`` of every coin at its last candle, from the ring buffer."""
+        slots, last = np.arange(len(self.names)), self.count - 1
+        return self.closes[slots, last % self.depth] - self.window_mean(self.closes, slots, last, window)
+
+    def slots(self, names):
+        codes = self.names.get_indexer(names)
+        if (codes < 0).any():
+            new = pd.unique(names[codes < 0])
+            self.names = self.names.append(pd.Index(new, dtype=object))
+            self.closes = np.vstack([self.closes, np.full((len(new), self.depth), np.nan)])
+            self.volumes = np.vstack([self.volumes, np.full((len(new), self.depth), np.nan)])
+            self.count = np.concatenate([self.count, np.zeros(len(new), dtype=np.int64)])
+            for window, gaps in self.gaps.items():
+                self.gaps[window] = np.concatenate([gaps, np.full(len(new), np.nan)])
+            codes = self.names.get_indexer(names)
+        return codes
+
+    def window_mean(self, buffer, slots, last, window):
+        """Mean of the ``window`` values of each slot ending at candle ``last``; NaN before that many."""
+        columns = (last[:, None] - np.arange(window)) % self.depth
+        means = buffer[slots[:, None], columns].mean(axis=1)
+        means[last + 1 < window] = np.nan
+        return means
+
+    def step(self, slots, closes, volumes):
+        """Add one candle to each of ``slots`` (distinct) and return the alerts as
+        ``(rule ids, candle positions, values)`` arrays."""
+        previous = np.where(self.count[slots] > 0,
+                            self.closes[slots, (self.count[slots] - 1) % self.depth], np.nan)
+        last = self.count[slots]
+        self.closes[slots, last % self.depth] = closes
+        self.volumes[slots, last % self.depth] = volumes
+        self.count[slots] += 1
+
+        found = []
+        thresholds, ids = self.moves
+        if len(ids):
+            change = (closes / previous - 1) * 100
+            candles, positions = fired_pairs(np.abs(change), thresholds)
+            found.append((ids[positions], candles, change[candles]))
+        for window, ids in self.crosses.items():
+            gap = closes - self.window_mean(self.closes, slots, last, window)
+            before = self.gaps[window][slots]
+            self.gaps[window][slots] = gap
+            candles = np.flatnonzero(np.sign(gap) * np.sign(before) < 0)
+            found.append((np.tile(ids, len(candles)), np.repeat(candles, len(ids)), np.repeat(gap[candles], len(ids))))
+        for window, (thresholds, ids) in self.spikes.items():
+            ratio = volumes / self.window_mean(self.volumes, slots, last - 1, window)
+            candles, positions = fired_pairs(ratio, thresholds)
+            found.append((ids[positions], candles, ratio[candles]))
+        return found
+
+    def update(self, candles, notify=True):
+        """Evaluate every rule on new candles (Name, Date, Close, Volume).
+
+        Candles of a coin must be newer than the ones it already saw. A
+        batch with several candles per coin is taken one candle per coin
+        at a time. Returns the alerts as a frame (see ``ALERT_COLUMNS``)
+        and sends each one to the sink when ``notify`` is set.
+        """
+        candles = candles.sort_values(['Name', 'Date'], kind='mergesort')
+        names = candles['Name'].to_numpy(dtype=object)
+        dates = candles['Date'].to_numpy()
+        closes = candles['Close'].to_numpy(dtype=np.float64)
+        volumes = candles['Volume'].to_numpy(dtype=np.float64)
+        with self._lock:
+            slots = self.slots(names)
+            # Position of each candle among the candles of its coin
+            starts = np.r_[0, np.flatnonzero(slots[1:] != slots[:-1]) + 1]
+            rank = np.arange(len(slots)) - np.repeat(starts, np.diff(np.r_[starts, len(slots)]))
+            ids, positions, values = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)], [np.empty(0)]
+            for k in range(rank.max() + 1 if len(rank) else 0):
+                rows = np.flatnonzero(rank == k)
+                for rule_ids, found, found_values in self.step(slots[rows], closes[rows], volumes[rows]):
+                    ids.append(rule_ids)
+                    positions.append(rows[found])
+                    values.append(found_values)
+            ids, positions = np.concatenate(ids), np.concatenate(positions)
+            alerts = pd.DataFrame({'Rule': self.labels[ids], 'Name': names[positions], 'Date': dates[positions],
+                                   'Value': np.concatenate(values)}, columns=ALERT_COLUMNS)
+        if notify and self.sink is not None:
+            for row in alerts.to_dict('records'):
+                self.sink.add(row)
+        return alerts
+
+    def warm(self, history):
+        """Fill the per-coin state from past candles without raising alerts."""
+        self.update(history.groupby('Name', sort=False, observed=True).tail(self.depth + 1), notify=False)
@@ -0,0 +1,78 @@
+"""Dashboard computations, free of any Streamlit calls.
+
+The Streamlit apps only lay out what these functions return, so the same
+figures can come from batch jobs, services or benchmarks.
+"""
+import pandas as pd
+
+from .coin_index import TIME_FRAME_OFFSETS
+from .formatting import format_usd
+from .metrics import intraday_metrics
+
+TABLE_COLUMNS = ['Name', 'Close', 'Range (%)', '24h (%)', 'Volume', 'Marketcap']
+
+
+def filter_window(service, name=None, start=None, end=None, time_frame=None):
+    """Rows of ``name`` (all coins when None) from ``start`` to ``end``.
+
+    ``time_frame`` (a key of ``TIME_FRAME_OFFSETS``) widens the start so
+    percent changes at the start of the range have their history. Returns
+    the rows and the widened start.
+    """
+    if start is not None:
+        start = pd.Timestamp(start)
+        if time_frame is not None:
+            start = start - TIME_FRAME_OFFSETS[time_frame]
+    end = None if end is None else pd.Timestamp(end)
+    return service.view(name, start, end), start
+
+
+def intraday_window(store, name, start, end):
+    """Intraday bars of ``name`` from a :class:`partitions.PartitionedStore`
+    between ``start`` and ``end``, with true '1h (%)' and '24h (%)' changes.
+
+    A day before ``start`` is read as well so the first bars have their
+    24-hour reference; only the partitions overlapping that range are opened.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    bars = store.read([name], start - pd.Timedelta(hours=24), end)
+    bars = pd.concat([bars, intraday_metrics(bars)], axis=1)
+    return bars[bars['Date'] >= start].reset_index(drop=True)
+
+
+def price_table(data, rows=10):
+    """First ``rows`` rows of the prices table, with Volume and Marketcap in M/B USD."""
+    table = data.head(rows)[TABLE_COLUMNS].copy()
+    table['Volume'] = format_usd(table['Volume'])
+    table['Marketcap'] = format_usd(table['Marketcap'])
+    return table
+
+
+def extreme_moves(data):
+    """Days with the largest increase and decrease of ``Price Change (%)``.
+
+    The change is computed from Open and Close when ``data`` does not carry
+    the column.
+    """
+    if 'Price Change (%)' in data:
+        change = data['Price Change (%)']
+    else:
+        change = (data['Close'] - data['Open']) / data['Open'] * 100
+    up, down = change.idxmax(), change.idxmin()
+    return {'Largest Increase Date': data.at[up, 'Date'], 'Largest Increase (%)': change[up],
+            'Largest Decrease Date': data.at[down, 'Date'], 'Largest Decrease (%)': change[down]}
+
+
+def compare(service, parameter, stat='mean', start=None, end=None):
+    """``stat`` of ``parameter`` per coin, sorted ascending."""
+    return service.aggregates.lookup(parameter, stat, start, end).sort_values()
+
+
+def per_coin(data, column, stat='sum'):
+    """``stat`` of ``column`` per coin over the rows of ``data`` (e.g. a filtered window)."""
+    return data.groupby('Name', sort=False, observed=True)[column].agg(stat)
+
+
+def top_and_worst(values, n=3):
+    """The ``n`` largest and ``n`` smallest ``values``."""
+    return values.nlargest(n), values.nsmallest(n)
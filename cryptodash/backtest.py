@@ -0,0 +1,188 @@
+"""Portfolio backtests on the daily closes of data.csv.
+
+A strategy maps a (dates x coins) close-price array to the daily value of
+the portfolio, vectorized over the date axis. :func:`sweep` runs many
+strategy configurations across a process pool; every worker receives the
+price matrix once, when it starts, instead of with each task. Run as a
+script for a moving-average crossover sweep over every coin::
+
+    python -m cryptodash.backtest --workers 8
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from .data_store import read_data
+
+# Crypto markets trade every day of the year
+PERIODS_PER_YEAR = 365
+
+
+def price_matrix(data):
+    """Close prices as a (dates x coins) frame, NaN before a coin is listed."""
+    return data.pivot(index='Date', columns='Name', values='Close')
+
+
+def basket(prices, coins):
+    """Closes of ``coins`` from the first date all of them trade, gaps filled forward."""
+    prices = prices[list(coins)]
+    start = prices.notna().all(axis=1).to_numpy().argmax()
+    return prices.iloc[start:].ffill()
+
+
+def normalize(weights, n):
+    weights = np.full(n, 1.0 / n) if weights is None else np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum()
+
+
+def buy_and_hold(prices, weights=None):
+    """Buy once on the first day with ``weights`` (equal by default) and hold."""
+    weights = normalize(weights, prices.shape[1])
+    return (prices / prices[0]) @ weights
+
+
+def rebalance(prices, weights=None, period=30):
+    """Reset the holdings to ``weights`` every ``period`` days."""
+    weights = normalize(weights, prices.shape[1])
+    starts = np.arange(len(prices)) // period * period
+    # Growth since the last rebalance, and the value carried into each period
+    growth = (prices / prices[starts]) @ weights
+    period_starts = np.arange(0, len(prices), period)
+    period_ends = np.minimum(period_starts + period, len(prices) - 1)
+    factors = (prices[period_ends] / prices[period_starts]) @ weights
+    carried = np.concatenate([[1.0], np.cumprod(factors)[:-1]])
+    return carried[starts // period] * growth
+
+
+def dca(prices, weights=None, period=30):
+    """Invest the same amount every ``period`` days (dollar-cost averaging).
+
+    The result is the portfolio value per dollar invested so far, so it is
+    comparable with the other strategies' growth of one dollar.
+    """
+    weights = normalize(weights, prices.shape[1])
+    buys = np.zeros(len(prices))
+    buys[::period] = 1.0
+    units = np.cumsum(buys[:, None] * weights / prices, axis=0)
+    return (units * prices).sum(axis=1) / np.cumsum(buys)
+
+
+def ma_crossover(prices, fast=20, slow=50):
+    """Hold a coin while its ``fast``-day SMA is above its ``slow``-day SMA, else cash.
+
+    Each coin gets an equal share of the starting capital. The signal of a
+    day's close is traded on the next day.
+    """
+    total = np.cumsum(prices, axis=0)
+
+    def sma(window):
+        means = np.full(prices.shape, np.nan)
+        means[window - 1:] = total[window - 1:]
+        means[window:] -= total[:-window]
+        return means / window
+
+    invested = np.nan_to_num(sma(fast) > sma(slow)).astype(np.float64)
+    returns = np.zeros(prices.shape)
+    returns[1:] = prices[1:] / prices[:-1] - 1
+    returns[1:] *= invested[:-1]
+    return np.cumprod(1 + returns, axis=0).mean(axis=1)
+
+
+STRATEGIES = {
+    'buy_and_hold': buy_and_hold,
+    'rebalance': rebalance,
+    'dca': dca,
+    'ma_crossover': ma_crossover,
+}
+
+
+def cagr(equity, dates):
+    years = (dates[-1] - dates[0]) / pd.Timedelta(days=365.25)
+    return (equity[-1] / equity[0]) ** (1 / years) - 1 if years > 0 else np.nan
+
+
+def max_drawdown(equity):
+    """Largest peak-to-trough loss, as a negative fraction."""
+    return (equity / np.maximum.accumulate(equity) - 1).min()
+
+
+def sharpe(equity, periods_per_year=PERIODS_PER_YEAR):
+    """Annualized Sharpe ratio of the daily returns, with a zero risk-free rate."""
+    returns = np.diff(equity) / equity[:-1]
+    std = returns.std(ddof=1)
+    return returns.mean() / std * np.sqrt(periods_per_year) if std > 0 else np.nan
+
+
+def evaluate(equity, dates):
+    return {'CAGR': cagr(equity, dates), 'Max Drawdown': max_drawdown(equity), 'Sharpe': sharpe(equity)}
+
+
+def run(prices, strategy, coins, **params):
+    """Equity curve (a Series starting at 1) of one strategy configuration."""
+    prices = basket(prices, coins)
+    equity = STRATEGIES[strategy](prices.to_numpy(), **params)
+    return pd.Series(equity / equity[0], index=prices.index, name=strategy)
+
+
+# Price matrix of a sweep worker, set once by its initializer
+_prices = None
+
+
+def _attach(prices):
+    global _prices
+    _prices = prices
+
+
+def _run_batch(configs):
+    results = []
+    for config in configs:
+        params = {key: value for key, value in config.items() if key not in ('strategy', 'coins')}
+        equity = run(_prices, config['strategy'], config['coins'], **params)
+        results.append({**config, **evaluate(equity.to_numpy(), equity.index)})
+    return results
+
+
+def grid(strategy, coins, **params):
+    """Configurations for every combination of ``params`` values, e.g. ``fast=[10, 20]``."""
+    names = list(params)
+    return [{'strategy': strategy, 'coins': coins, **dict(zip(names, values))}
+            for values in product(*params.values())]
+
+
+def sweep(prices, configs, workers=None):
+    """Run ``configs`` (dicts with ``strategy``, ``coins`` and parameters) in parallel.
+
+    Configurations are sent in batches, a few per worker, so the cost of a
+    task round trip is shared by many backtests. Returns one row of
+    metrics per configuration.
+    """
+    workers = workers or os.cpu_count()
+    size = max(len(configs) // (workers * 4), 1)
+    batches = [configs[i:i + size] for i in range(0, len(configs), size)]
+    with ProcessPoolExecutor(workers, initializer=_attach, initargs=(prices,)) as executor:
+        results = [row for rows in executor.map(_run_batch, batches) for row in rows]
+    return pd.DataFrame(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep moving-average crossovers over every coin')
+    parser.add_argument('--csv', default='data.csv')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    prices = price_matrix(read_data(args.csv))
+    configs = [config for coin in prices.columns
+               for config in grid('ma_crossover', (coin,), fast=range(5, 55, 5), slow=range(20, 220, 10))
+               if config['fast'] < config['slow']]
+    results = sweep(prices, configs, args.workers)
+    print(f'Ran {len(results)} configurations')
+    print(results.sort_values('Sharpe', ascending=False).head(args.top).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
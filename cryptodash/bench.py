@@ -0,0 +1,151 @@
+"""Benchmarks of the stages of an app_8 rerun.
+
+Each stage is timed on data.csv and on copies scaled up by coin count and
+history length. Results are written to JSON together with the versions
+they were measured on; pass an earlier file to ``--compare`` to see the
+change per stage::
+
+    python -m cryptodash.bench --scales 1x 10x 100x --output bench_results.json
+    python -m cryptodash.bench --compare bench_results.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from .charts import (candlestick_figure, comparison_figure, historical_performance_figure, limit_points,
+                     market_cap_figure, price_change_figure, seven_day_change_figure)
+from .data_service import DataService
+from .data_store import DATE_FORMAT, parse_csv, read_data
+from .metrics import compute_metrics
+
+# Label -> (coin multiplier, history multiplier)
+SCALES = {
+    '1x': (1, 1),
+    '10x': (5, 2),
+    '100x': (10, 10),
+    '1000x': (50, 20),
+}
+
+
+def scale_dataset(data, coins=1, history=1):
+    """``data`` with ``coins`` copies of every coin and ``history`` times its date span.
+
+    Copies of a coin are named ``'<Name> <k>'``; earlier history repeats the
+    existing rows shifted back by whole spans.
+    """
+    span = data['Date'].max() - data['Date'].min() + pd.Timedelta(days=1)
+    pieces = []
+    for k in range(coins):
+        copy = data if k == 0 else data.assign(Name=data['Name'] + f' {k}', Symbol=data['Symbol'] + str(k))
+        for h in range(history - 1, -1, -1):
+            pieces.append(copy.assign(Date=copy['Date'] - span * h) if h else copy)
+    scaled = pd.concat(pieces, ignore_index=True).sort_values(['Name', 'Date'], kind='mergesort')
+    scaled['SNo'] = np.arange(1, len(scaled) + 1)
+    return scaled.reset_index(drop=True)
+
+
+def timed(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def stages(csv_path):
+    """``(stage name, callable)`` pairs, in the order a rerun of app_8 runs them."""
+    data = read_data(csv_path)
+    service = DataService(csv_path)
+    name = service.names[0]
+    start, end = data['Date'].min(), data['Date'].max()
+    view = service.view(name, start, end)
+
+    def figures():
+        for build in (seven_day_change_figure, market_cap_figure, historical_performance_figure,
+                      price_change_figure):
+            limit_points(build(view))
+        limit_points(candlestick_figure(view))
+        limit_points(comparison_figure(service.aggregates.lookup('Volume').sort_values(), 'Volume'))
+
+    return [
+        ('load_csv', lambda: parse_csv(csv_path)),
+        ('load_cached', lambda: read_data(csv_path)),
+        ('build_service', lambda: DataService(csv_path)),
+        ('filter_mask', lambda: data[(data['Name'] == name) & (data['Date'] >= start) & (data['Date'] <= end)]),
+        ('filter_index', lambda: service.view(name, start, end)),
+        ('derived_columns', lambda: compute_metrics(service.data)),
+        ('figures', figures),
+        ('groupby', lambda: data.groupby('Name')['Volume'].mean()),
+        ('groupby_cube', lambda: service.aggregates.lookup('Volume')),
+    ]
+
+
+def run(csv_path='data.csv', scales=('1x', '10x', '100x'), repeat=5):
+    """Time every stage at every scale; returns one result dict per (scale, stage)."""
+    base = parse_csv(csv_path)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for label in scales:
+            path = csv_path
+            if SCALES[label] != (1, 1):
+                path = os.path.join(directory, f'data_{label}.csv')
+                scale_dataset(base, *SCALES[label]).to_csv(path, index=False, date_format=DATE_FORMAT)
+            # The first read writes the columnar cache; time the warm path like a rerun
+            rows = len(read_data(path))
+            for stage, function in stages(path):
+                times = timed(function, repeat)
+                results.append({'scale': label, 'rows': rows, 'stage': stage, 'min': min(times),
+                                'median': float(np.median(times)), 'mean': float(np.mean(times)),
+                                'repeat': repeat})
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {'commit': commit, 'python': platform.python_version(), 'numpy': np.__version__,
+            'pandas': pd.__version__, 'machine': platform.machine(), 'cpus': os.cpu_count(),
+            'timestamp': pd.Timestamp.now().isoformat()}
+
+
+def compare(results, baseline):
+    """Median time of every stage relative to ``baseline`` (> 1 is slower)."""
+    old = {(row['scale'], row['stage']): row['median'] for row in baseline}
+    return pd.DataFrame([{'scale': row['scale'], 'stage': row['stage'], 'median': row['median'],
+                          'baseline': old.get((row['scale'], row['stage']), np.nan),
+                          'ratio': row['median'] / old.get((row['scale'], row['stage']), np.nan)}
+                         for row in results])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the stages of a dashboard rerun')
+    parser.add_argument('--csv', default='data.csv')
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['1x', '10x', '100x'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', default=None, help='earlier results file to compare against')
+    args = parser.parse_args()
+
+    results = run(args.csv, args.scales, args.repeat)
+    table = pd.DataFrame(results)
+    if args.compare:
+        with open(args.compare) as f:
+            table = compare(results, json.load(f)['results'])
+    print(table.to_string(index=False))
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
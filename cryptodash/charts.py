@@ -0,0 +1,199 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .downsample import MAX_POINTS, segmented_indices, segmented_ohlc_buckets
+
+# Per-point trace attributes that have to be thinned along with x and y
+POINT_ATTRIBUTES = ['x', 'y', 'customdata', 'text', 'hovertext']
+
+
+def limit_points(fig, max_points=MAX_POINTS):
+    """Downsample every trace of ``fig`` to at most ``max_points`` points.
+
+    Line, area and bar traces keep a MinMax/LTTB selection of their points;
+    candlesticks are merged into wider candles. A trace holding several
+    coins one after another is thinned coin by coin. The payload sent to the
+    browser is bounded by ``max_points`` per trace.
+
+    The selection is made once, when the figure is built: zooming in the
+    browser does not fetch more points, only narrowing the date range in
+    the sidebar (which builds a new figure) shows the full detail again.
+    """
+    for trace in fig.data:
+        if trace.type == 'candlestick':
+            if trace.x is not None and len(trace.x) > max_points:
+                trace.x, trace.open, trace.high, trace.low, trace.close = segmented_ohlc_buckets(
+                    trace.x, trace.open, trace.high, trace.low, trace.close, max_points)
+        elif trace.type in ('scatter', 'scattergl', 'bar'):
+            if trace.y is None or len(trace.y) <= max_points:
+                continue
+            x = trace.x if trace.x is not None else np.arange(len(trace.y))
+            keep = segmented_indices(x, trace.y, max_points)
+            n = len(trace.y)
+            for name in POINT_ATTRIBUTES:
+                values = trace[name]
+                if values is not None and not isinstance(values, str) and len(values) == n:
+                    trace[name] = np.asarray(values)[keep]
+            color = trace.marker.color
+            if color is not None and not isinstance(color, str) and len(color) == n:
+                trace.marker.color = np.asarray(color)[keep]
+    return fig
+
+
+class FigureCache:
+    """Bounded LRU of built figures, shared by every session.
+
+    Keys should hold every input of the figure (chart, coin, date range,
+    data version, ...), so a rerun only rebuilds the charts whose inputs
+    changed. Figures are stored after :func:`limit_points` and must not be
+    modified by callers.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the figure cached under ``key``, calling ``build()`` on a miss."""
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return self._figures[key]
+        fig = limit_points(build())
+        with self._lock:
+            self.misses += 1
+            self._figures[key] = fig
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+
+
+def seven_day_change_figure(data):
+    import plotly.express as px
+    # Create a line chart for 7-day percentage change
+    fig = px.line(data, x='Date', y='7d (%)', title='7-Day Percentage Change')
+
+    # Custom line and marker styling
+    fig.update_traces(
+        line=dict(width=2, color='royalblue'),
+        marker=dict(size=8, color='royalblue', line=dict(width=2, color='white'))
+    )
+
+    # Customize the layout
+    fig.update_layout(
+        xaxis_title='Date',
+        yaxis_title='7-Day Percentage Change (%)',
+        title_x=0.5,
+        height=500,
+        margin=dict(l=50, r=50, t=50, b=50),
+        plot_bgcolor='rgba(0,0,0,0)',  # Transparent plot background
+        paper_bgcolor='rgba(0,0,0,0.05)',  # Light gray paper background
+        font=dict(family='Arial', size=12, color='black')
+    )
+
+    # Remove gridlines
+    fig.update_xaxes(showgrid=False)
+    fig.update_yaxes(showgrid=False)
+    return fig
+
+
+def candlestick_figure(candles):
+    import plotly.graph_objects as go
+    # Create Candlestick Chart for Volume Trends
+    fig = go.Figure(data=[go.Candlestick(x=candles['Date'],
+                    open=candles['Open'],
+                    high=candles['High'],
+                    low=candles['Low'],
+                    close=candles['Close'])])
+
+    fig.update_layout(
+        title_text='Volume Trends',
+        yaxis_title='Prices in USD',
+        xaxis_title='Date',
+        showlegend=False
+    )
+    return fig
+
+
+def market_cap_figure(data):
+    import plotly.express as px
+    fig = px.line(data, x='Date', y='Marketcap', title='Market Capitalization Trends',
+                  labels={'Marketcap': 'Market Capitalization (USD)', 'Date': 'Date'})
+
+    fig.update_layout(
+        yaxis_title='Market Capitalization (USD)',
+        xaxis=dict(showline=True, showgrid=False),
+        yaxis=dict(showline=True, showgrid=True, gridcolor='lightgrey'),
+        showlegend=False
+    )
+    return fig
+
+
+def historical_performance_figure(data):
+    import plotly.express as px
+    # Create a figure using Plotly Express
+    fig = px.area(data, x='Date', y=['Open', 'High', 'Low', 'Close'],
+                  labels={'variable': 'Price Type', 'value': 'Price (USD)', 'Date': 'Date'},
+                  title='Historical Market Trends',
+                  color_discrete_map={'Open': 'blue', 'High': 'green', 'Low': 'red', 'Close': 'purple'})
+
+    # Add customizations to the figure
+    fig.update_xaxes(title_text='Date')
+    fig.update_yaxes(title_text='Prices in USD')
+    fig.update_layout(legend_title_text='Price Type')
+    return fig
+
+
+def price_change_figure(data):
+    import plotly.express as px
+    fig = px.bar(data, x='Date', y='Price Change (%)', title='Price Change (%) in USD', color='Price Change (%)', color_continuous_scale='RdBu')
+
+    fig.update_yaxes(title_text='Price Change (%) in USD')  # Add title to y-axis
+    fig.update_layout(showlegend=False)  # Remove legend
+    return fig
+
+
+def comparison_figure(grouped_data, comparison_parameter):
+    import plotly.express as px
+    # Create a bar chart to visualize the performance
+    fig = px.bar(
+        grouped_data,
+        x=comparison_parameter,
+        y=grouped_data.index,
+        orientation='h',
+        labels={comparison_parameter: f'{comparison_parameter} (USD)', 'index': 'Cryptocurrency'},
+        title=f'Average {comparison_parameter} for All Cryptocurrencies',
+        color=grouped_data.values,  # Add color to the bars
+        color_continuous_scale='Inferno',  # Choose a color scale
+        text=grouped_data.values.round(2),  # Display data values on the bars
+    )
+
+    # Customize the layout
+    fig.update_layout(
+        xaxis_title=f'{comparison_parameter} (USD)',  # X-axis title
+        yaxis_title='Cryptocurrency',  # Y-axis title
+        showlegend=False,  # Remove legend
+        plot_bgcolor='rgba(0, 0, 0, 0)',  # Transparent plot background
+        paper_bgcolor='black',  # Dark background
+        font=dict(color='white'),  # Font color
+    )
+    return fig
+
+
+def correlation_figure(matrix, title):
+    import plotly.express as px
+    fig = px.imshow(matrix, zmin=-1, zmax=1, color_continuous_scale='RdBu', title=title,
+                    labels={'color': 'Correlation'})
+    fig.update_layout(xaxis_title='', yaxis_title='')
+    return fig
@@ -0,0 +1,132 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# How far the "Select Time Frame" option widens the start of the date range
+TIME_FRAME_OFFSETS = {
+    "1 month": pd.DateOffset(months=1),
+    "7 days": pd.DateOffset(days=7),
+    "24 hours": pd.DateOffset(hours=24),
+}
+
+
+def to_datetime64(value):
+    return pd.Timestamp(value).to_datetime64().astype('datetime64[ns]')
+
+
+# Everything a lookup reads, published as one object: a reader takes the
+# snapshot once per call, so it never slices the frame of one version with
+# the offsets of another while rows are being appended
+Snapshot = namedtuple('Snapshot', ['data', 'dates', 'names', 'offsets'])
+
+
+class CoinIndex:
+    """Per-coin row offsets over a frame sorted by (Name, Date).
+
+    The frame is sorted once; each coin then owns a contiguous block of rows
+    and a date range inside that block is found with ``searchsorted``, so a
+    lookup costs O(log n) plus the size of the slice instead of a scan over
+    every row. ``offsets`` (``{name: (start, stop)}``, e.g. from
+    :func:`data_store.coin_offsets`) describes a frame that is already
+    sorted, so it is used as it is, without factorizing or sorting.
+    """
+
+    def __init__(self, data, offsets=None):
+        if offsets is None:
+            names = data['Name'].to_numpy()
+            dates = data['Date'].to_numpy()
+            codes, uniques = pd.factorize(names)
+            order = np.lexsort((dates, codes))
+            if not (order == np.arange(len(order))).all():
+                data = data.take(order)
+                codes, dates = codes[order], dates[order]
+            # Coin names in order of first appearance, like data['Name'].unique()
+            starts = np.searchsorted(codes, np.arange(len(uniques)), side='left')
+            stops = np.searchsorted(codes, np.arange(len(uniques)), side='right')
+            offsets = dict(zip(uniques, zip(starts, stops)))
+        else:
+            dates = data['Date'].to_numpy()
+        offsets = {name: (int(start), int(stop)) for name, (start, stop) in offsets.items()}
+        self.snapshot = Snapshot(data, dates, list(offsets), offsets)
+
+    @property
+    def data(self):
+        return self.snapshot.data
+
+    @data.setter
+    def data(self, data):
+        # Same rows in the same order, e.g. with more columns
+        self.snapshot = self.snapshot._replace(data=data)
+
+    @property
+    def dates(self):
+        return self.snapshot.dates
+
+    @property
+    def names(self):
+        return self.snapshot.names
+
+    @property
+    def offsets(self):
+        return self.snapshot.offsets
+
+    def bounds(self, name, start=None, end=None, snapshot=None):
+        """Row range ``(lo, hi)`` of ``name`` between ``start`` and ``end`` inclusive.
+
+        The range is into ``snapshot`` (the current one by default).
+        """
+        snapshot = self.snapshot if snapshot is None else snapshot
+        lo, hi = snapshot.offsets.get(name, (0, 0))
+        dates = snapshot.dates[lo:hi]
+        first = lo if start is None else lo + int(np.searchsorted(dates, to_datetime64(start), side='left'))
+        last = hi if end is None else lo + int(np.searchsorted(dates, to_datetime64(end), side='right'))
+        return first, max(first, last)
+
+    def slice(self, name=None, start=None, end=None):
+        """Rows of coin ``name`` (all coins when None) with ``start <= Date <= end``."""
+        snapshot = self.snapshot
+        if name is not None:
+            lo, hi = self.bounds(name, start, end, snapshot)
+            return snapshot.data.iloc[lo:hi]
+        ranges = [self.bounds(coin, start, end, snapshot) for coin in snapshot.names]
+        positions = np.concatenate([np.arange(lo, hi) for lo, hi in ranges] or [np.arange(0)])
+        return snapshot.data.iloc[positions]
+
+    def append(self, rows):
+        """Add ``rows`` after the stored rows of their coins.
+
+        Each coin's new rows must be later than the last date already stored
+        for it. Only the block boundaries are recomputed: existing rows keep
+        their order and nothing is re-sorted. The result is published as a
+        new snapshot; readers never see it half built. Appends themselves
+        must not run concurrently (``DataService`` holds its lock).
+        """
+        current = self.snapshot
+        rows = rows.sort_values(['Name', 'Date'], kind='mergesort')
+        groups = dict(tuple(rows.groupby('Name', sort=False, observed=True)))
+        for name, group in groups.items():
+            lo, hi = current.offsets.get(name, (0, 0))
+            if hi > lo and group['Date'].iloc[0] <= current.dates[hi - 1]:
+                raise ValueError(f'rows for {name} must be newer than {current.dates[hi - 1]}')
+
+        names = current.names + [name for name in groups if name not in current.offsets]
+        pieces, offsets, start = [], {}, 0
+        for name in names:
+            lo, hi = current.offsets.get(name, (0, 0))
+            block = [current.data.iloc[lo:hi]] if hi > lo else []
+            if name in groups:
+                block.append(groups[name])
+            size = sum(len(piece) for piece in block)
+            pieces.extend(block)
+            offsets[name] = (start, start + size)
+            start += size
+
+        data = pd.concat(pieces)
+        # Keep a compact schema compact: concat falls back to the new rows' dtypes
+        dtypes = {column: dtype for column, dtype in current.data.dtypes.items()
+                  if column in data and data[column].dtype != dtype}
+        if dtypes:
+            data = data.astype({column: 'category' if dtype == 'category' else dtype
+                                for column, dtype in dtypes.items()})
+        self.snapshot = Snapshot(data, data['Date'].to_numpy(), names, offsets)
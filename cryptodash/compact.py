@@ -0,0 +1,86 @@
+"""Compact in-memory schema for the price frame.
+
+Name and Symbol become categoricals (one small integer code per row
+instead of a Python string), SNo is narrowed or dropped, and the float
+columns can be stored as float32. A float column is only narrowed when
+the round trip keeps every value within its tolerance in ``MAX_ERROR``
+(half a cent for prices, half a unit for Volume and Marketcap);
+otherwise it stays float64. The report gives the measured error of every
+float column either way.
+"""
+import numpy as np
+import pandas as pd
+
+from .data_store import FLOAT_COLUMNS, STRING_COLUMNS
+
+# Largest absolute round-trip error accepted per column. float32 has a
+# 24-bit mantissa, so prices above ~65k USD or volumes above ~16M lose
+# more than this and stay float64.
+MAX_ERROR = {'High': 0.005, 'Low': 0.005, 'Open': 0.005, 'Close': 0.005, 'Volume': 0.5, 'Marketcap': 0.5}
+
+
+def absolute_error(values, narrowed):
+    """Largest absolute difference between ``values`` and their narrowed copy."""
+    values = np.asarray(values, dtype=np.float64)
+    restored = np.asarray(narrowed, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        error = np.abs(restored - values)
+    # NaNs round-trip exactly; infinities from overflow do not
+    error = np.where(np.isnan(values), np.where(np.isnan(restored), 0, np.inf), error)
+    return float(np.nanmax(error)) if len(values) else 0.0
+
+
+def compact(data, float_columns=FLOAT_COLUMNS, float_dtype='float32', sno='int32', max_error=None):
+    """Return ``(compact_data, report)``.
+
+    ``float_columns`` are narrowed to ``float_dtype`` where the round trip
+    stays within ``max_error`` (a dict of absolute tolerances, default
+    ``MAX_ERROR``); ``sno`` is the dtype for SNo, or None to drop it.
+    ``report`` has one row per column with its bytes before and after.
+    """
+    max_error = {**MAX_ERROR, **(max_error or {})}
+    result = {}
+    notes = {}
+    errors = {}
+    for column in data.columns:
+        values = data[column]
+        if column in STRING_COLUMNS:
+            values = values.astype('category')
+        elif column == 'SNo':
+            if sno is None:
+                notes[column] = 'dropped'
+                continue
+            if values.min() < np.iinfo(sno).min or values.max() > np.iinfo(sno).max:
+                notes[column] = f'kept: out of {sno} range'
+            else:
+                values = values.astype(sno)
+        elif column in float_columns and float_dtype is not None:
+            narrowed = values.astype(float_dtype)
+            errors[column] = absolute_error(values, narrowed)
+            if errors[column] <= max_error.get(column, 0):
+                values = narrowed
+            else:
+                notes[column] = f'kept: error above {max_error.get(column, 0):g}'
+        result[column] = values
+    compact_data = pd.DataFrame(result, index=data.index)
+    return compact_data, memory_report(data, compact_data, notes, errors)
+
+
+def memory_report(before, after, notes=None, errors=None):
+    """Bytes per column before and after, with a total row.
+
+    ``errors`` holds the measured round-trip error of narrowed columns.
+    """
+    notes = notes or {}
+    errors = errors or {}
+    old = before.memory_usage(index=False, deep=True)
+    new = after.memory_usage(index=False, deep=True).reindex(old.index, fill_value=0)
+    report = pd.DataFrame({
+        'Before (MB)': old / 1e6,
+        'After (MB)': new / 1e6,
+        'Dtype': [str(after[column].dtype) if column in after else '' for column in old.index],
+        'Max Error': [errors.get(column, np.nan) for column in old.index],
+        'Note': [notes.get(column, '') for column in old.index],
+    })
+    report.loc['Total'] = [old.sum() / 1e6, new.sum() / 1e6, '', np.nan, f'{old.sum() / max(new.sum(), 1):.1f}x smaller']
+    return report
@@ -0,0 +1,87 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Window lengths (in days) offered by the dashboard
+WINDOWS = [30, 90, 180, 365]
+
+
+def returns_matrix(data):
+    """Daily Close returns as a (dates x coins) frame.
+
+    Days on which a coin has no row (before its listing, or gaps) are NaN,
+    and so is the return of the day after a gap.
+    """
+    close = data.pivot(index='Date', columns='Name', values='Close')
+    return close / close.shift(1) - 1
+
+
+def window_sums(values, window):
+    """Sums of ``values`` over trailing ``window`` rows along axis 0, from one cumulative sum."""
+    total = np.cumsum(values, axis=0)
+    result = total.copy()
+    result[window:] -= total[:-window]
+    return result
+
+
+def rolling_correlation(returns, window, min_periods=None):
+    """Rolling correlation of every pair of columns of ``returns``.
+
+    Returns a (dates x coins x coins) array; entry ``[t, i, j]`` is the
+    correlation of coins ``i`` and ``j`` over the ``window`` rows ending at
+    ``t``, on the days where both have a return. Every pair comes out of
+    the same few cumulative sums over the stacked pair products, so there
+    is no loop over pairs. Pairs with fewer than ``min_periods`` (default
+    ``window``) common days are NaN.
+    """
+    min_periods = window if min_periods is None else min_periods
+    x = np.asarray(returns, dtype=np.float64)
+    valid = ~np.isnan(x)
+    x = np.where(valid, x, 0.0)
+    mask = valid.astype(np.float64)
+
+    # Sums over the days where both coins of a pair have a return
+    count = window_sums(mask[:, :, None] * mask[:, None, :], window)
+    sum_x = window_sums(x[:, :, None] * mask[:, None, :], window)
+    sum_xx = window_sums((x * x)[:, :, None] * mask[:, None, :], window)
+    sum_xy = window_sums(x[:, :, None] * x[:, None, :], window)
+    sum_y = sum_x.transpose(0, 2, 1)
+    sum_yy = sum_xx.transpose(0, 2, 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = sum_xy - sum_x * sum_y / count
+        variance_x = sum_xx - sum_x * sum_x / count
+        variance_y = sum_yy - sum_y * sum_y / count
+        correlation = covariance / np.sqrt(variance_x * variance_y)
+    correlation[count < min_periods] = np.nan
+    return np.clip(correlation, -1, 1)
+
+
+class CorrelationMatrix:
+    """Cross-coin return correlations, with one rolling tensor per window.
+
+    The returns matrix is pivoted once; :meth:`rolling` computes the tensor
+    for a window on first use and keeps it, so moving through dates only
+    indexes into a cached array.
+    """
+
+    def __init__(self, data):
+        self.returns = returns_matrix(data)
+        self.dates = self.returns.index
+        # Candles are stamped 23:59; lookups go by calendar day
+        self.days = self.dates.normalize()
+        self.names = self.returns.columns
+        self._tensors = {}
+        self._lock = threading.Lock()
+
+    def rolling(self, window):
+        with self._lock:
+            if window not in self._tensors:
+                self._tensors[window] = rolling_correlation(self.returns.to_numpy(), window)
+            return self._tensors[window]
+
+    def at(self, window, date):
+        """Correlation matrix of the ``window`` days ending on the day of ``date`` (or the last day before it)."""
+        position = max(self.days.searchsorted(pd.Timestamp(date).normalize(), side='right') - 1, 0)
+        return pd.DataFrame(self.rolling(window)[position], index=self.names, columns=self.names)
@@ -0,0 +1,133 @@
+import threading
+
+import pandas as pd
+
+from .aggregates import AggregateCube
+from .coin_index import CoinIndex
+from .compact import compact as compact_frame
+from .indicators import IndicatorEngine
+from .data_store import COLUMNS, coin_offsets, ensure_cache, read_columns, read_filtered
+from .metrics import compute_metrics
+from .resample import resample_ohlcv
+
+# Rows of history a new candle needs to compute its metrics ('7d (%)')
+METRIC_CONTEXT = 7
+
+
+def with_columns(frame, columns):
+    """Return ``frame`` plus the ``columns`` mapping without copying ``frame``.
+
+    The result is a shallow copy: existing columns keep pointing at the
+    original arrays and only the new columns are allocated, so the shared
+    base data is never duplicated or modified.
+    """
+    result = frame.copy(deep=False)
+    for name, values in columns.items():
+        result[name] = values
+    return result
+
+
+class DataService:
+    """Read-only dataset shared by every session of a process.
+
+    Wrap construction in ``st.cache_resource`` so all Streamlit sessions use
+    the same instance. The percent-change columns from
+    :func:`metrics.compute_metrics` are computed once here, so views already
+    carry them. Callers get views from :meth:`view` and add their own
+    columns with :func:`with_columns`; nothing should assign into
+    ``data`` or the frames returned by :meth:`view` directly.
+
+    With ``compact=True`` the data uses the schema of :mod:`compact`
+    (categorical names, float32 prices where precise enough) and
+    ``memory`` holds the memory report. ``names``, ``start`` and ``end``
+    load only those coins and dates (see :func:`data_store.read_filtered`),
+    so a service for a few coins never materializes the rest of the file.
+    """
+
+    def __init__(self, csv_path='data.csv', compact=False, names=None, start=None, end=None):
+        self.csv_path = csv_path
+        offsets = None
+        if names is None and start is None and end is None:
+            # The cache is sorted by (Name, Date): index the mapped columns as they are
+            cache_dir, manifest = ensure_cache(csv_path)
+            data, offsets = read_columns(cache_dir, manifest), coin_offsets(manifest)
+        else:
+            data = read_filtered(csv_path, names=names, start=start, end=end)
+        # Per-column memory before/after when the compact schema is used
+        self.memory = None
+        if compact:
+            data, self.memory = compact_frame(data)
+        self.index = CoinIndex(data, offsets)
+        self.index.data = with_columns(self.index.data, compute_metrics(self.index.data))
+        # Bumped on every append so caches keyed on it go stale
+        self.version = 0
+        # Per-coin comparison statistics, kept current on append
+        self.aggregates = AggregateCube(self.data)
+        # Resampled bars, keyed by (coin, frequency)
+        self._bars = {}
+        # Technical indicators, built on first use
+        self._indicators = None
+        self._lock = threading.Lock()
+
+    @property
+    def data(self):
+        return self.index.data
+
+    @property
+    def names(self):
+        return self.index.names
+
+    @property
+    def indicators(self):
+        """:class:`indicators.IndicatorEngine` over ``data``, kept current on append."""
+        with self._lock:
+            if self._indicators is None:
+                self._indicators = IndicatorEngine(self.data)
+            return self._indicators
+
+    def view(self, name=None, start=None, end=None):
+        """Zero-copy rows of ``name`` (all coins when None) between ``start`` and ``end``."""
+        return self.index.slice(name, start, end)
+
+    def bars(self, name, freq, start=None, end=None):
+        """OHLCV bars of ``name`` at period ``freq`` (see :mod:`resample`).
+
+        Bars are computed once per (coin, frequency) and cached; ``freq`` None
+        returns the daily rows. ``start`` and ``end`` filter on the bar date.
+        """
+        if freq is None:
+            return self.view(name, start, end)
+        names = self.names if name is None else [name]
+        for coin in names:
+            if (coin, freq) not in self._bars:
+                self._bars[coin, freq] = resample_ohlcv(self.view(coin), freq)
+        bars = [self._bars[coin, freq] for coin in names]
+        bars = pd.concat(bars, ignore_index=True) if len(bars) > 1 else bars[0]
+        if start is not None:
+            bars = bars[bars['Date'] >= pd.Timestamp(start)]
+        if end is not None:
+            bars = bars[bars['Date'] <= pd.Timestamp(end)]
+        return bars
+
+    def append(self, rows):
+        """Add new candles (``data.csv`` columns) to the shared dataset in place.
+
+        Metrics are computed for the new rows only, using the last few stored
+        rows of each coin as context, and the index is extended rather than
+        rebuilt.
+        """
+        rows = rows[COLUMNS].sort_values(['Name', 'Date'], kind='mergesort')
+        with self._lock:
+            rows.index = pd.RangeIndex(self.data.index.max() + 1, self.data.index.max() + 1 + len(rows))
+            context = [self.view(name)[COLUMNS].tail(METRIC_CONTEXT) for name in rows['Name'].unique()]
+            combined = pd.concat(context + [rows]).sort_values(['Name', 'Date'], kind='mergesort')
+            metrics = compute_metrics(combined).loc[rows.index]
+            self.index.append(with_columns(rows, metrics))
+            touched = set(rows['Name'])
+            for key in [key for key in self._bars if key[0] in touched]:
+                del self._bars[key]
+            self.aggregates.update(pd.concat([self.view(name) for name in touched]))
+            if self._indicators is not None:
+                self._indicators.extend(rows)
+            self.version += 1
+        return rows
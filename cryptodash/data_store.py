@@ -0,0 +1,371 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Format used by the Date column of data.csv, e.g. '4/29/13 23:59'
+DATE_FORMAT = '%m/%d/%y %H:%M'
+
+# Columns of data.csv and how they are stored in the columnar cache. The
+# float columns share one (columns x rows) array so pandas can wrap it as a
+# single block without copying it out of the memory map.
+STRING_COLUMNS = ['Name', 'Symbol']
+FLOAT_COLUMNS = ['High', 'Low', 'Open', 'Close', 'Volume', 'Marketcap']
+COLUMNS = ['SNo', 'Name', 'Symbol', 'Date'] + FLOAT_COLUMNS
+
+# Bump when the on-disk layout changes so stale caches are rebuilt
+CACHE_VERSION = 2
+MANIFEST = 'manifest.json'
+
+# Rows read per chunk by the streaming loaders
+CHUNK_ROWS = 100_000
+
+
+def default_cache_dir(csv_path):
+    """Cache directory for ``csv_path``: ``.cache/<file name>`` next to the CSV."""
+    folder, name = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(folder, '.cache', name)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_csv(csv_path):
+    """Parse ``csv_path`` with explicit dtypes and date format."""
+    dtypes = {'SNo': 'int64', 'Name': object, 'Symbol': object}
+    dtypes.update((column, 'float64') for column in FLOAT_COLUMNS)
+    data = pd.read_csv(csv_path, dtype=dtypes)
+    data['Date'] = pd.to_datetime(data['Date'], format=DATE_FORMAT)
+    return data[COLUMNS]
+
+
+def save_array(path, values):
+    # Write to a uniquely named file next to the target and swap it in, so
+    # concurrent writers never share a temp file and readers that still
+    # have the old file memory-mapped keep a valid mapping
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+    with os.fdopen(fd, 'wb') as f:
+        np.save(f, values)
+    os.replace(tmp_path, path)
+
+
+def write_columns(data, cache_dir, source):
+    """Write ``data`` as a new version of the cache: ``.npy`` files plus a manifest.
+
+    Rows are stored sorted by (Name, Date) like ``CoinIndex.data``, so every
+    coin is one block of the mapped columns and an index over them needs no
+    copy. String columns are stored as integer codes with their categories
+    kept in the manifest; float columns go into a single ``prices.npy``.
+    ``source`` describes the CSV the cache was built from.
+    """
+    codes, _ = pd.factorize(data['Name'])
+    order = np.lexsort((data['Date'].to_numpy(), codes))
+    if not (order == np.arange(len(order))).all():
+        data = data.take(order)
+    arrays, categories = {}, {}
+    for column in STRING_COLUMNS:
+        codes, uniques = pd.factorize(data[column])
+        arrays[column] = codes.astype(np.int32)
+        categories[column] = [str(value) for value in uniques]
+    arrays['SNo'] = data['SNo'].to_numpy(dtype='int64')
+    arrays['prices'] = np.ascontiguousarray(data[FLOAT_COLUMNS].to_numpy(dtype='float64').T)
+    arrays['Date'] = data['Date'].to_numpy(dtype='datetime64[ns]')
+    return publish_columns(cache_dir, arrays, categories, source)
+
+
+def publish_columns(cache_dir, arrays, categories, source):
+    """Save the cache ``arrays`` (sorted by Name code, then Date) and make them current.
+
+    Each version gets its own directory and becomes current with the one
+    replace of the manifest, so a reader sees either the old or the new set
+    of files, never a mix. The version it replaces is kept for readers
+    that are still opening it; the one before that is removed.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    folder = tempfile.mkdtemp(prefix='columns-', dir=cache_dir)
+    for name, values in arrays.items():
+        np.save(os.path.join(folder, f'{name}.npy'), values)
+
+    # Name codes number the coins in block order
+    coins = np.arange(len(categories['Name']))
+    starts = np.searchsorted(arrays['Name'], coins, side='left')
+    stops = np.searchsorted(arrays['Name'], coins, side='right')
+    offsets = {name: [int(start), int(stop)] for name, start, stop in zip(categories['Name'], starts, stops)}
+    previous = read_manifest(cache_dir)
+    manifest = {'version': CACHE_VERSION, 'rows': len(arrays['SNo']), 'source': source,
+                'categories': categories, 'offsets': offsets,
+                'columns': os.path.basename(folder), 'previous': previous and previous['columns']}
+    write_manifest(cache_dir, manifest)
+    if previous and previous['previous'] not in (None, manifest['columns']):
+        shutil.rmtree(os.path.join(cache_dir, previous['previous']), ignore_errors=True)
+    return manifest
+
+
+def write_manifest(cache_dir, manifest):
+    """Replace the manifest atomically, so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=cache_dir)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(cache_dir, MANIFEST))
+
+
+def read_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != CACHE_VERSION:
+        return None
+    return manifest
+
+
+def load_array(directory, name, mmap_mode='r'):
+    # Plain ndarray view over the mapping, so pandas doesn't carry np.memmap around
+    return np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode).view(np.ndarray)
+
+
+def columns_dir(cache_dir, manifest):
+    """Directory holding the column files of the cache version ``manifest`` describes."""
+    return os.path.join(cache_dir, manifest['columns'])
+
+
+def coin_offsets(manifest):
+    """``{name: (start, stop)}`` row block of every coin in the cache, for ``CoinIndex``."""
+    return {name: (start, stop) for name, (start, stop) in manifest['offsets'].items()}
+
+
+def read_columns(cache_dir, manifest, mmap_mode='r', rows=None, categorical=False):
+    """Load the cached columns into a DataFrame.
+
+    The price block is memory-mapped, so only the pages that are touched get
+    read from disk; the remaining columns are small fixed-width arrays.
+    With ``rows`` (positions) only those rows are read and copied out. With
+    ``categorical`` Name and Symbol are categoricals over the stored codes
+    rather than object arrays holding a pointer per row.
+    """
+    folder = columns_dir(cache_dir, manifest)
+
+    def column(name):
+        values = load_array(folder, name, mmap_mode)
+        return values if rows is None else values[..., rows]
+
+    data = pd.DataFrame(column('prices').T, columns=FLOAT_COLUMNS, copy=False)
+    data.insert(0, 'SNo', column('SNo'))
+    for loc, name in enumerate(STRING_COLUMNS, start=1):
+        categories = np.array(manifest['categories'][name], dtype=object)
+        if categorical:
+            data.insert(loc, name, pd.Categorical.from_codes(column(name), categories))
+        else:
+            data.insert(loc, name, categories.take(column(name)))
+    data.insert(3, 'Date', column('Date'))
+    return data
+
+
+def source_info(csv_path):
+    stat = os.stat(csv_path)
+    return {'path': os.path.abspath(csv_path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def current_manifest(csv_path, cache_dir=None):
+    """Manifest of the cache of ``csv_path`` if it is current, else None.
+
+    The cache is keyed on the CSV's mtime and size, falling back to its
+    SHA-256 when those change (e.g. after a checkout that only touched the
+    timestamp).
+    """
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    info = source_info(csv_path)
+    manifest = read_manifest(cache_dir)
+
+    if manifest is not None:
+        cached = manifest['source']
+        if cached['mtime_ns'] == info['mtime_ns'] and cached['size'] == info['size']:
+            return manifest
+        if cached['size'] == info['size']:
+            digest = file_digest(csv_path)
+            if digest == cached['sha256']:
+                # Same content, new timestamp: refresh the key only
+                manifest['source'] = {**info, 'sha256': digest}
+                write_manifest(cache_dir, manifest)
+                return manifest
+    return None
+
+
+def ensure_cache(csv_path, cache_dir=None):
+    """Make sure the columnar cache for ``csv_path`` is current.
+
+    Returns ``(cache_dir, manifest)``.
+    """
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    manifest = current_manifest(csv_path, cache_dir)
+    if manifest is None:
+        info = source_info(csv_path)
+        info['sha256'] = file_digest(csv_path)
+        manifest = write_columns(parse_csv(csv_path), cache_dir, info)
+    return cache_dir, manifest
+
+
+def read_data(csv_path='data.csv', cache_dir=None):
+    """Load ``csv_path`` through its columnar cache.
+
+    The first call parses the CSV once and writes the cache; later calls
+    memory-map the cached columns instead of re-parsing.
+    """
+    cache_dir, manifest = ensure_cache(csv_path, cache_dir)
+    return read_columns(cache_dir, manifest)
+
+
+def insert_rows(cache_dir, manifest, rows):
+    """Columns of the cache with ``rows`` inserted at the end of their coin's block.
+
+    Returns ``(arrays, categories, rows)`` for :func:`publish_columns`, with
+    ``rows`` in the order they were inserted. New coins get a block after
+    the stored ones. The stored columns are only copied, never re-sorted.
+    """
+    folder = columns_dir(cache_dir, manifest)
+    categories = {column: list(manifest['categories'][column]) for column in STRING_COLUMNS}
+    codes = {}
+    for column in STRING_COLUMNS:
+        known = {value: code for code, value in enumerate(categories[column])}
+        for value in rows[column].unique():
+            if value not in known:
+                known[value] = len(categories[column])
+                categories[column].append(str(value))
+        codes[column] = rows[column].map(known).to_numpy(dtype=np.int32)
+    new_dates = rows['Date'].to_numpy(dtype='datetime64[ns]')
+    order = np.lexsort((new_dates, codes['Name']))
+    rows, new_dates = rows.iloc[order], new_dates[order]
+    codes = {column: values[order] for column, values in codes.items()}
+
+    dates = load_array(folder, 'Date')
+    stored = len(manifest['offsets'])
+    stops = np.array([stop for _, stop in manifest['offsets'].values()]
+                     + [manifest['rows']] * (len(categories['Name']) - stored), dtype=np.int64)
+    positions = stops[codes['Name']]
+    existing = codes['Name'] < stored
+    if (new_dates[existing] <= dates[positions[existing] - 1]).any():
+        raise ValueError('rows must be newer than the stored rows of their coin')
+
+    arrays = {column: np.insert(load_array(folder, column), positions, codes[column]) for column in STRING_COLUMNS}
+    arrays['SNo'] = np.insert(load_array(folder, 'SNo'), positions, rows['SNo'].to_numpy(dtype='int64'))
+    arrays['prices'] = np.insert(load_array(folder, 'prices'), positions,
+                                 rows[FLOAT_COLUMNS].to_numpy(dtype='float64').T, axis=1)
+    arrays['Date'] = np.insert(dates, positions, new_dates)
+    return arrays, categories, rows
+
+
+def append_rows(csv_path, rows, cache_dir=None):
+    """Append ``rows`` to ``csv_path`` and insert them into its columnar cache.
+
+    The cache stays sorted by (Name, Date): the new version is the stored
+    memory-mapped columns copied once with each coin's new rows spliced in
+    after its block, so the history in the CSV is never parsed again. Each
+    coin's rows must be newer than the ones it already has.
+    """
+    cache_dir, manifest = ensure_cache(csv_path, cache_dir)
+    arrays, categories, rows = insert_rows(cache_dir, manifest, rows[COLUMNS])
+
+    text = rows.assign(Date=rows['Date'].dt.strftime(DATE_FORMAT)).to_csv(header=False, index=False)
+    with open(csv_path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                text = '\n' + text
+        f.write(text.encode())
+
+    info = source_info(csv_path)
+    info['sha256'] = file_digest(csv_path)
+    return publish_columns(cache_dir, arrays, categories, info)
+
+
+def date_mask(dates, start=None, end=None):
+    mask = np.ones(len(dates), dtype=bool)
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start).to_datetime64()
+    if end is not None:
+        mask &= dates <= pd.Timestamp(end).to_datetime64()
+    return mask
+
+
+def scan_csv(csv_path, names=None, symbols=None, start=None, end=None, chunk_rows=CHUNK_ROWS):
+    """Rows of ``csv_path`` matching the predicates, read ``chunk_rows`` at a time.
+
+    Name and Symbol are checked before the dates of a chunk are parsed, and
+    only matching rows are kept, so memory is bounded by the chunk size
+    plus the result.
+    """
+    dtypes = {'SNo': 'int64', 'Name': object, 'Symbol': object, 'Date': object}
+    dtypes.update((column, 'float64') for column in FLOAT_COLUMNS)
+    pieces = []
+    for chunk in pd.read_csv(csv_path, dtype=dtypes, chunksize=chunk_rows):
+        if names is not None:
+            chunk = chunk[chunk['Name'].isin(names)]
+        if symbols is not None:
+            chunk = chunk[chunk['Symbol'].isin(symbols)]
+        if chunk.empty:
+            continue
+        chunk['Date'] = pd.to_datetime(chunk['Date'], format=DATE_FORMAT)
+        chunk = chunk[date_mask(chunk['Date'].to_numpy(), start, end)]
+        if not chunk.empty:
+            pieces.append(chunk[COLUMNS])
+    if not pieces:
+        return empty_frame()
+    return pd.concat(pieces, ignore_index=True)
+
+
+def empty_frame():
+    data = pd.DataFrame({column: pd.Series(dtype='float64') for column in COLUMNS})
+    data = data.astype({'SNo': 'int64', 'Name': object, 'Symbol': object, 'Date': 'datetime64[ns]'})
+    return data
+
+
+def scan_columns(cache_dir, manifest, names=None, symbols=None, start=None, end=None, chunk_rows=CHUNK_ROWS):
+    """Rows of the columnar cache matching the predicates.
+
+    The Name/Symbol codes and dates are scanned from the memory map in
+    chunks; only the matching rows of the other columns are then read.
+    """
+    folder = columns_dir(cache_dir, manifest)
+    masks = []
+    for column, wanted in (('Name', names), ('Symbol', symbols)):
+        if wanted is not None:
+            categories = manifest['categories'][column]
+            masks.append((load_array(folder, column), [categories.index(value) for value in wanted
+                                                        if value in categories]))
+    dates = load_array(folder, 'Date')
+    positions = []
+    for lo in range(0, manifest['rows'], chunk_rows):
+        hi = min(lo + chunk_rows, manifest['rows'])
+        mask = date_mask(dates[lo:hi], start, end)
+        for codes, wanted in masks:
+            mask &= np.isin(codes[lo:hi], wanted)
+        positions.append(np.flatnonzero(mask) + lo)
+    rows = np.concatenate(positions) if positions else np.empty(0, dtype=np.int64)
+    return read_columns(cache_dir, manifest, rows=rows)
+
+
+def read_filtered(csv_path='data.csv', names=None, symbols=None, start=None, end=None, cache_dir=None,
+                  chunk_rows=CHUNK_ROWS):
+    """Rows of coins ``names`` / ``symbols`` with ``start <= Date <= end``.
+
+    Reads the columnar cache when it is current, the CSV in chunks
+    otherwise (without building the cache, which would parse the whole
+    file). Predicates left as None match everything.
+    """
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    manifest = current_manifest(csv_path, cache_dir)
+    if manifest is not None:
+        return scan_columns(cache_dir, manifest, names, symbols, start, end, chunk_rows)
+    return scan_csv(csv_path, names, symbols, start, end, chunk_rows)
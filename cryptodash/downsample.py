@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+# Points kept per trace; chart payloads stay at this size however long the history
+MAX_POINTS = 1000
+
+# MinMax pre-selection keeps this many candidates per output point for LTTB
+MINMAX_RATIO = 4
+
+
+def as_numeric(x):
+    x = np.asarray(x)
+    if x.dtype == object:
+        # Plotly keeps dates as arrays of Timestamps
+        x = pd.to_datetime(x).to_numpy()
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def minmax_indices(y, n_out):
+    """Indices of the min and max of ``y`` in ``n_out // 2`` equal buckets."""
+    n_buckets = max(n_out // 2, 1)
+    edges = np.linspace(0, len(y), n_buckets + 1).astype(np.int64)
+    # Reduce over the padded (bucket x width) matrix in one go
+    width = int(np.diff(edges).max())
+    positions = edges[:-1, None] + np.arange(width)
+    valid = positions < edges[1:, None]
+    positions = np.minimum(positions, len(y) - 1)
+    values = y[positions]
+    valid &= ~np.isnan(values)
+    low = np.where(valid, values, np.inf).argmin(axis=1)
+    high = np.where(valid, values, -np.inf).argmax(axis=1)
+    rows = np.arange(n_buckets)
+    return np.unique(np.concatenate([positions[rows, low], positions[rows, high]]))
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets selection of ``n_out`` points.
+
+    Every bucket is scored against the mean of the previous and next bucket,
+    which keeps the whole selection vectorized instead of walking the buckets
+    one by one.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    bucket = np.searchsorted(edges, np.arange(1, n - 1), side='right') - 1
+    counts = np.bincount(bucket, minlength=n_out - 2).astype(np.float64)
+    counts[counts == 0] = 1
+    mean_x = np.bincount(bucket, x[1:-1], minlength=n_out - 2) / counts
+    mean_y = np.bincount(bucket, y[1:-1], minlength=n_out - 2) / counts
+    prev_x = np.concatenate([[x[0]], mean_x[:-1]])
+    prev_y = np.concatenate([[y[0]], mean_y[:-1]])
+    next_x = np.concatenate([mean_x[1:], [x[-1]]])
+    next_y = np.concatenate([mean_y[1:], [y[-1]]])
+
+    inner_x, inner_y = x[1:-1], y[1:-1]
+    area = np.abs((prev_x[bucket] - next_x[bucket]) * (inner_y - prev_y[bucket])
+                  - (prev_x[bucket] - inner_x) * (next_y[bucket] - prev_y[bucket]))
+    area = np.nan_to_num(area, nan=-1.0)
+    # Highest-area point of every bucket: sort by (bucket, -area), keep the first
+    order = np.lexsort((-area, bucket))
+    first = np.concatenate([[True], bucket[order][1:] != bucket[order][:-1]])
+    chosen = order[first] + 1
+    return np.concatenate([[0], chosen, [n - 1]])
+
+
+def minmax_lttb_indices(x, y, n_out=MAX_POINTS):
+    """Indices of at most ``n_out`` points that preserve the shape of ``(x, y)``.
+
+    MinMax pre-selection narrows long series down to ``MINMAX_RATIO * n_out``
+    candidates (keeping every spike), then LTTB picks the final points.
+    """
+    x, y = as_numeric(x), as_numeric(y)
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    candidates = np.arange(n)
+    if n > MINMAX_RATIO * n_out:
+        candidates = minmax_indices(y, MINMAX_RATIO * n_out)
+        candidates = np.unique(np.concatenate([[0], candidates, [n - 1]]))
+    return candidates[lttb_indices(x[candidates], y[candidates], n_out)]
+
+
+def segments(x):
+    """``(start, stop)`` of each run of non-decreasing ``x``.
+
+    Frames of several coins (the 'All' view) are the coins one after
+    another, so x jumps back at every coin boundary.
+    """
+    x = as_numeric(x)
+    bounds = np.concatenate([[0], np.flatnonzero(np.diff(x) < 0) + 1, [len(x)]])
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def segment_budgets(runs, n_out):
+    """Split ``n_out`` points over ``runs`` in proportion to their lengths (at least 3 each)."""
+    sizes = np.array([stop - start for start, stop in runs])
+    return np.maximum(n_out * sizes // max(sizes.sum(), 1), 3)
+
+
+def segmented_indices(x, y, n_out=MAX_POINTS):
+    """:func:`minmax_lttb_indices` applied to each sorted run of ``x`` separately."""
+    runs = segments(x)
+    if len(runs) == 1:
+        return minmax_lttb_indices(x, y, n_out)
+    x, y = np.asarray(x), np.asarray(y)
+    return np.concatenate([start + minmax_lttb_indices(x[start:stop], y[start:stop], budget)
+                           for (start, stop), budget in zip(runs, segment_budgets(runs, n_out))])
+
+
+def ohlc_buckets(x, open_, high, low, close, n_out=MAX_POINTS):
+    """Merge consecutive candles into at most ``n_out`` wider candles.
+
+    Each bucket opens at its first candle, closes at its last and spans the
+    highest high and lowest low in between.
+    """
+    n = len(x)
+    if n <= n_out:
+        return x, open_, high, low, close
+    starts = np.linspace(0, n, n_out + 1).astype(np.int64)[:-1]
+    stops = np.append(starts[1:], n) - 1
+    return (np.asarray(x)[starts], np.asarray(open_)[starts],
+            np.fmax.reduceat(np.asarray(high, dtype=np.float64), starts),
+            np.fmin.reduceat(np.asarray(low, dtype=np.float64), starts),
+            np.asarray(close)[stops])
+
+
+def segmented_ohlc_buckets(x, open_, high, low, close, n_out=MAX_POINTS):
+    """:func:`ohlc_buckets` applied to each sorted run of ``x`` separately."""
+    runs = segments(x)
+    columns = [np.asarray(values) for values in (x, open_, high, low, close)]
+    if len(runs) == 1:
+        return ohlc_buckets(*columns, n_out)
+    parts = [ohlc_buckets(*[values[start:stop] for values in columns], budget)
+             for (start, stop), budget in zip(runs, segment_budgets(runs, n_out))]
+    return tuple(np.concatenate([np.asarray(part[i]) for part in parts]) for i in range(5))
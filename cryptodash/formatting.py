@@ -0,0 +1,190 @@
+"""Vectorized number formatting for the dashboard tables.
+
+Strings are assembled as a (rows x characters) matrix of code points and
+viewed as a NumPy unicode array, so a whole column is formatted without a
+Python call per cell.
+"""
+import numpy as np
+import pandas as pd
+
+# Largest scaled integer the fixed-point path can hold exactly
+MAX_EXACT = 2 ** 53
+
+SCALES = [(1e9, 'B'), (1e6, 'M')]
+
+
+def _digit_count(values):
+    powers = 10 ** np.arange(1, 19, dtype=np.int64)
+    return 1 + np.searchsorted(powers, values, side='right')
+
+
+def _codes(strings):
+    strings = np.asarray(strings, dtype=str)
+    width = max(strings.dtype.itemsize // 4, 1)
+    return np.ascontiguousarray(strings.astype(f'U{width}')).view(np.uint32).reshape(len(strings), width)
+
+
+def _compose(negative, whole, frac, frac_len, suffix):
+    """Assemble ``[-]whole[.frac]suffix`` strings (an object array) for every row.
+
+    Rows are sorted by layout (sign, digit count, fraction length), so each
+    layout is a contiguous block of rows whose characters sit in the same
+    columns and are written with plain slices.
+    """
+    n = len(whole)
+    if not n:
+        return np.zeros(0, dtype=object)
+    n_digits = _digit_count(whole)
+    digits = int(n_digits.max())
+    max_frac = int(frac_len.max())
+    # 32-bit division is markedly faster and enough for up to 9 digits
+    small = np.uint32 if max(digits, max_frac) <= 9 else np.int64
+    powers = 10 ** np.arange(max(digits, max_frac), dtype=small)
+    group = (negative * (digits + 1) + n_digits) * (max_frac + 1) + frac_len
+    # Few distinct layouts: a stable sort of small integers is a radix sort
+    order = np.argsort(group.astype(np.int16), kind='stable')
+    whole, frac, suffix = whole[order].astype(small), frac[order].astype(small), _codes(suffix)[order]
+
+    width = 1 + digits + 1 + max_frac + suffix.shape[1]
+    chars = np.zeros((n, width), dtype=np.uint32)
+    sizes = np.bincount(group)
+    stop = 0
+    for key in np.flatnonzero(sizes):
+        start, stop = stop, stop + sizes[key]
+        sign, rest = divmod(key, (digits + 1) * (max_frac + 1))
+        count, length = divmod(rest, max_frac + 1)
+        block = chars[start:stop]
+        if sign:
+            block[:, 0] = ord('-')
+        block[:, sign:sign + count] = ord('0') + whole[start:stop, None] // powers[:count][::-1] % 10
+        column = sign + count
+        if length:
+            block[:, column] = ord('.')
+            block[:, column + 1:column + 1 + length] = (
+                ord('0') + frac[start:stop, None] // powers[:length][::-1] % 10)
+            column += 1 + length
+        block[:, column:column + suffix.shape[1]] = suffix[start:stop]
+
+    result = np.empty(n, dtype=object)
+    result[order] = chars.view(f'U{width}').ravel()
+    return result
+
+
+def _split(a):
+    # Veltkamp split of a float into two halves that multiply exactly
+    c = 134217729.0 * a
+    high = c - (c - a)
+    return high, a - high
+
+
+def _round_scaled(magnitude, decimals):
+    """``magnitude * 10**decimals`` rounded half-even on its exact value.
+
+    Python formats the exact binary value of a float, so a plain
+    ``np.round(x * 100)`` is off whenever the product itself rounds across
+    a half. The product's rounding error is recovered with Dekker's
+    two-product and breaks those ties.
+    """
+    scale = 10.0 ** decimals
+    product = magnitude * scale
+    a_high, a_low = _split(magnitude)
+    s_high, s_low = _split(scale)
+    error = ((a_high * s_high - product) + a_high * s_low + a_low * s_high) + a_low * s_low
+    lower = np.floor(product)
+    distance = (product - lower) - 0.5
+    up = (distance > 0) | ((distance == 0) & ((error > 0) | ((error == 0) & (lower % 2 == 1))))
+    return lower + up
+
+
+def _fallback(values, spec, suffix, rows):
+    # Non-finite and very large values are rare; format them one by one
+    return [f'{value:{spec}}{end}' for value, end in zip(values[rows], suffix[rows])]
+
+
+def format_fixed(values, decimals=2, suffix=''):
+    """Vectorized ``f'{value:.{decimals}f}{suffix}'`` for an array of floats.
+
+    ``suffix`` is a string or an array with one suffix per value.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    suffix = np.broadcast_to(np.asarray(suffix, dtype=str), values.shape)
+    magnitude = np.abs(values)
+    exact = np.isfinite(magnitude) & (magnitude * 10.0 ** decimals < MAX_EXACT)
+    scaled = _round_scaled(np.where(exact, magnitude, 0), decimals).astype(np.int64)
+
+    result = _compose(np.signbit(values) & exact, scaled // 10 ** decimals, scaled % 10 ** decimals,
+                      np.full(len(values), decimals, dtype=np.int64), suffix)
+    inexact = np.flatnonzero(~exact)
+    result[inexact] = _fallback(values, f'.{decimals}f', suffix, inexact)
+    return result
+
+
+def format_significant(values, digits=3, suffix=''):
+    """Vectorized ``f'{value:.{digits}g}{suffix}'`` for an array of floats."""
+    values = np.asarray(values, dtype=np.float64)
+    suffix = np.broadcast_to(np.asarray(suffix, dtype=str), values.shape)
+    magnitude = np.abs(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        exponent = np.floor(np.log10(np.where(magnitude > 0, magnitude, 1)))
+    # log10 can land on the wrong side of an exact power of ten
+    exponent -= magnitude < 10.0 ** exponent
+    exact = np.isfinite(values) & (exponent >= -4) & (exponent < digits)
+    decimals = np.where(exact, digits - 1 - exponent, 0).astype(np.int64)
+    scaled = _round_scaled(np.where(exact, magnitude, 0), decimals).astype(np.int64)
+
+    # Rounding can carry into the next power of ten (9.996 -> 10.0)
+    carry = exact & (scaled >= 10 ** digits)
+    exponent += carry
+    scaled = np.where(carry, scaled // 10, scaled)
+    decimals -= carry
+    # Same switch to exponent notation as Python's 'g' format
+    exact &= exponent < digits
+    decimals = np.where(exact, decimals, 0)
+
+    frac = scaled % 10 ** decimals
+    # 'g' drops trailing zeros of the fraction, and the point with them
+    for _ in range(int(decimals.max()) if len(values) else 0):
+        trailing = (decimals > 0) & (frac % 10 == 0)
+        frac = np.where(trailing, frac // 10, frac)
+        scaled = np.where(trailing, scaled // 10, scaled)
+        decimals = decimals - trailing
+
+    result = _compose(np.signbit(values) & exact, scaled // 10 ** decimals, frac, decimals,
+                      suffix)
+    inexact = np.flatnonzero(~exact)
+    result[inexact] = _fallback(values, f'.{digits}g', suffix, inexact)
+    return result
+
+
+def format_usd(values, decimals=2, significant=None, min_scale=1.0):
+    """Format amounts as M/B-scaled USD strings, e.g. ``'1.23B USD'``.
+
+    Values of at least a billion (million) are shown in B (M); smaller ones
+    unscaled, or in the unit of ``min_scale`` if that is larger. With
+    ``significant`` the number keeps that many significant digits instead
+    of ``decimals`` decimal places.
+    """
+    index = values.index if isinstance(values, pd.Series) else None
+    values = np.asarray(values, dtype=np.float64)
+    conditions = [values >= scale for scale, _ in SCALES]
+    scale = np.select(conditions, [scale for scale, _ in SCALES], 1.0)
+    unit = np.select(conditions, [f'{unit} USD' for _, unit in SCALES], ' USD')
+    for floor, floor_unit in SCALES:
+        if min_scale >= floor:
+            below = scale < floor
+            scale = np.where(below, floor, scale)
+            unit = np.where(below, f'{floor_unit} USD', unit)
+            break
+
+    if significant is None:
+        formatted = format_fixed(values / scale, decimals, unit)
+    else:
+        formatted = format_significant(values / scale, significant, unit)
+    return formatted if index is None else pd.Series(formatted, index=index)
+
+
+def ranked_table(values, title, **format_options):
+    """Table of ``values`` (indexed by coin) numbered 1, 2, 3... with a formatted column."""
+    table = pd.DataFrame({'Name': values.index, title: format_usd(values.to_numpy(), **format_options)})
+    table.index = range(1, len(table) + 1)
+    return table
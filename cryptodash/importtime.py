@@ -0,0 +1,77 @@
+"""Startup profile: how long the imports of a dashboard script take.
+
+The module-level imports of the script are run in a fresh interpreter
+under ``python -X importtime`` and the report is summarized per module::
+
+    python -m cryptodash.importtime app_8.py --budget-ms 1500
+
+With ``--budget-ms`` the exit status is 1 when the total is over budget,
+so a CI job can keep cold start in check.
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+
+def module_imports(script_path):
+    """Source of the ``import`` statements at the top level of ``script_path``.
+
+    Imports inside functions or blocks only run when that code does, so
+    they are not part of startup.
+    """
+    with open(script_path) as f:
+        source = f.read()
+    return '\n'.join(ast.get_source_segment(source, node) for node in ast.parse(source, script_path).body
+                     if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def parse_report(stderr):
+    """Rows of an ``-X importtime`` report: module, depth, self and cumulative ms."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append({'Module': name.strip(), 'Depth': depth, 'Self (ms)': int(self_us) / 1000,
+                     'Cumulative (ms)': int(cumulative_us) / 1000})
+    return pd.DataFrame(rows, columns=['Module', 'Depth', 'Self (ms)', 'Cumulative (ms)'])
+
+
+def profile(script_path, python=sys.executable):
+    """Import-time report of the top-level imports of ``script_path``."""
+    source = module_imports(script_path)
+    # Run next to the script so its local imports (cryptodash) resolve the same way
+    result = subprocess.run([python, '-X', 'importtime', '-c', source], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(script_path)))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_report(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the import time of a dashboard script')
+    parser.add_argument('script')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--budget-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    report = profile(args.script)
+    # Depth 0 entries are the imports the script asked for; their cumulative times add up to the total
+    top_level = report[report['Depth'] == 0].sort_values('Cumulative (ms)', ascending=False)
+    total = top_level['Cumulative (ms)'].sum()
+    print(top_level.head(args.top).to_string(index=False))
+    print('\nSlowest modules overall:')
+    print(report.sort_values('Self (ms)', ascending=False).head(args.top).to_string(index=False))
+    print(f'\nTotal import time: {total:.0f} ms')
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f'Over budget of {args.budget_ms:.0f} ms')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
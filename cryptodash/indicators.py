@@ -0,0 +1,183 @@
+"""Technical indicators for every coin at once.
+
+The engine works on a frame sorted by (Name, Date): windowed indicators
+(SMA, Bollinger bands) reduce strided windows that are masked at coin
+boundaries, recursive ones (EMA, MACD, RSI, ATR) use a grouped exponential
+mean, so the whole history is one pass. The recursive state is kept per
+coin, and :meth:`IndicatorEngine.extend` carries it forward over newly
+appended candles.
+"""
+import numpy as np
+import pandas as pd
+
+SMA_WINDOWS = (10, 20, 50)
+# Must include the MACD fast and slow spans
+EMA_SPANS = (12, 26)
+BOLLINGER_WINDOW = 20
+BOLLINGER_WIDTH = 2
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+
+
+def rolling(values, starts, window, reduce):
+    """``reduce`` over trailing windows of ``values`` that never cross a coin's first row (``starts``).
+
+    Rows without a full window are NaN.
+    """
+    result = np.full(len(values), np.nan)
+    if len(values) < window:
+        return result
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    last = np.arange(window - 1, len(values))
+    valid = last - window + 1 >= starts[last]
+    result[last[valid]] = reduce(windows[valid])
+    return result
+
+
+def ewm_step(previous, value, alpha):
+    return value if np.isnan(previous) else previous + alpha * (value - previous)
+
+
+class IndicatorEngine:
+    """SMA, EMA, Bollinger bands, RSI, MACD and ATR for every coin.
+
+    ``values`` holds one row per row of ``data`` (same index labels);
+    ``state`` keeps, per coin, what the recursive indicators need to
+    continue: the last EMAs, Wilder averages and close.
+    """
+
+    def __init__(self, data):
+        self.values = self.compute(data)
+        self.state = {}
+        self.closes = {}
+        last_rows = data.groupby('Name', sort=False, observed=True).tail(1).index
+        history = max(max(SMA_WINDOWS), BOLLINGER_WINDOW)
+        for name, closes in data.groupby('Name', sort=False, observed=True)['Close']:
+            self.closes[name] = closes.to_numpy()[-(history - 1):]
+        for label in last_rows:
+            row = self.values.loc[label]
+            self.state[data.at[label, 'Name']] = {
+                'close': data.at[label, 'Close'],
+                **{f'EMA {span}': row[f'EMA {span}'] for span in EMA_SPANS},
+                'MACD Signal': row['MACD Signal'],
+                'avg_gain': row['_avg_gain'],
+                'avg_loss': row['_avg_loss'],
+                'ATR': row[f'ATR {ATR_PERIOD}'],
+            }
+        self.values = self.values.drop(columns=['_avg_gain', '_avg_loss'])
+
+    @staticmethod
+    def compute(data):
+        names = data['Name'].to_numpy()
+        codes = pd.factorize(names)[0]
+        # Offset of the first row of each row's coin
+        boundaries = np.flatnonzero(np.diff(codes, prepend=-1) != 0)
+        starts = np.repeat(boundaries, np.diff(np.append(boundaries, len(codes))))
+        close = data['Close'].to_numpy(dtype=np.float64)
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        values = {}
+
+        for window in SMA_WINDOWS:
+            values[f'SMA {window}'] = rolling(close, starts, window, lambda w: w.mean(axis=1))
+
+        middle = rolling(close, starts, BOLLINGER_WINDOW, lambda w: w.mean(axis=1))
+        std = rolling(close, starts, BOLLINGER_WINDOW, lambda w: w.std(axis=1, ddof=1))
+        values['BB Middle'] = middle
+        values['BB Upper'] = middle + BOLLINGER_WIDTH * std
+        values['BB Lower'] = middle - BOLLINGER_WIDTH * std
+
+        previous = pd.Series(np.where(np.arange(len(close)) > starts, np.roll(close, 1), np.nan), index=data.index)
+        by_coin = pd.Series(codes, index=data.index)
+
+        def ewm(series, **params):
+            result = series.groupby(by_coin, sort=False).ewm(adjust=False, **params).mean()
+            return result.droplevel(0).reindex(series.index)
+
+        close_series = pd.Series(close, index=data.index)
+        for span in EMA_SPANS:
+            values[f'EMA {span}'] = ewm(close_series, span=span).to_numpy()
+        # MACD is the difference of the EMA 12 and EMA 26 lines
+        macd = pd.Series(values[f'EMA {MACD_FAST}'] - values[f'EMA {MACD_SLOW}'], index=data.index)
+        signal = ewm(macd, span=MACD_SIGNAL)
+        values['MACD'] = macd.to_numpy()
+        values['MACD Signal'] = signal.to_numpy()
+        values['MACD Hist'] = (macd - signal).to_numpy()
+
+        change = close_series - previous
+        avg_gain = ewm(change.clip(lower=0), alpha=1 / RSI_PERIOD)
+        avg_loss = ewm((-change).clip(lower=0), alpha=1 / RSI_PERIOD)
+        values[f'RSI {RSI_PERIOD}'] = rsi(avg_gain.to_numpy(), avg_loss.to_numpy())
+        values['_avg_gain'] = avg_gain.to_numpy()
+        values['_avg_loss'] = avg_loss.to_numpy()
+
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+        values[f'ATR {ATR_PERIOD}'] = ewm(pd.Series(true_range, index=data.index), alpha=1 / ATR_PERIOD).to_numpy()
+        return pd.DataFrame(values, index=data.index)
+
+    def slice(self, frame):
+        """Indicator rows for the rows of ``frame`` (a view of the same data)."""
+        return self.values.loc[frame.index]
+
+    def extend(self, rows):
+        """Compute indicators for new candles from the stored per-coin state.
+
+        ``rows`` must be newer than everything seen so far for their coins;
+        the cost depends only on the number of new rows.
+        """
+        rows = rows.sort_values(['Name', 'Date'], kind='mergesort')
+        history = max(max(SMA_WINDOWS), BOLLINGER_WINDOW)
+        records = []
+        for name, group in rows.groupby('Name', sort=False, observed=True):
+            state = self.state.get(name)
+            if state is None:
+                state = {'close': np.nan, 'MACD Signal': np.nan, 'avg_gain': np.nan, 'avg_loss': np.nan,
+                         'ATR': np.nan, **{f'EMA {span}': np.nan for span in EMA_SPANS}}
+            closes = np.concatenate([self.closes.get(name, np.empty(0)), group['Close'].to_numpy(dtype=np.float64)])
+            offset = len(closes) - len(group)
+            for i, (label, row) in enumerate(group.iterrows()):
+                close, high, low, previous = row['Close'], row['High'], row['Low'], state['close']
+                window = closes[:offset + i + 1]
+                record = {f'SMA {w}': window[-w:].mean() if len(window) >= w else np.nan for w in SMA_WINDOWS}
+                band = window[-BOLLINGER_WINDOW:]
+                if len(band) >= BOLLINGER_WINDOW:
+                    middle, std = band.mean(), band.std(ddof=1)
+                else:
+                    middle = std = np.nan
+                record.update({'BB Middle': middle, 'BB Upper': middle + BOLLINGER_WIDTH * std,
+                               'BB Lower': middle - BOLLINGER_WIDTH * std})
+
+                for span in EMA_SPANS:
+                    state[f'EMA {span}'] = ewm_step(state[f'EMA {span}'], close, 2 / (span + 1))
+                    record[f'EMA {span}'] = state[f'EMA {span}']
+                macd = state[f'EMA {MACD_FAST}'] - state[f'EMA {MACD_SLOW}']
+                state['MACD Signal'] = ewm_step(state['MACD Signal'], macd, 2 / (MACD_SIGNAL + 1))
+                record.update({'MACD': macd, 'MACD Signal': state['MACD Signal'],
+                               'MACD Hist': macd - state['MACD Signal']})
+
+                if not np.isnan(previous):
+                    change = close - previous
+                    state['avg_gain'] = ewm_step(state['avg_gain'], max(change, 0.0), 1 / RSI_PERIOD)
+                    state['avg_loss'] = ewm_step(state['avg_loss'], max(-change, 0.0), 1 / RSI_PERIOD)
+                record[f'RSI {RSI_PERIOD}'] = float(rsi(state['avg_gain'], state['avg_loss']))
+
+                true_range = high - low if np.isnan(previous) else max(high - low, abs(high - previous),
+                                                                       abs(low - previous))
+                state['ATR'] = ewm_step(state['ATR'], true_range, 1 / ATR_PERIOD)
+                record[f'ATR {ATR_PERIOD}'] = state['ATR']
+                state['close'] = close
+                records.append((label, record))
+
+            self.state[name] = state
+            self.closes[name] = closes[-(history - 1):]
+
+        new = pd.DataFrame([record for _, record in records], index=[label for label, _ in records],
+                           columns=self.values.columns)
+        self.values = pd.concat([self.values, new])
+        return new
+
+
+def rsi(avg_gain, avg_loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(avg_loss == 0, np.where(avg_gain > 0, 100.0, np.nan), 100 - 100 / (1 + avg_gain / avg_loss))
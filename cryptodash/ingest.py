@@ -0,0 +1,154 @@
+"""Incremental ingestion of new daily candles.
+
+Fetchers are callables ``fetcher(name, symbol, since)`` that return a
+DataFrame of candles strictly after ``since`` with Date, High, Low, Open,
+Close, Volume and (optionally) Marketcap columns. Run as a script to pull
+the latest candles for every coin in data.csv::
+
+    python -m cryptodash.ingest --source yfinance
+"""
+import argparse
+import os
+import threading
+
+import pandas as pd
+
+from .data_service import DataService
+from .data_store import COLUMNS, append_rows
+
+# Daily candles in data.csv are stamped at the end of the day
+CANDLE_TIME = pd.Timedelta(hours=23, minutes=59)
+
+
+class FrameFeed:
+    """Serve candles from an in-memory frame, e.g. a local replay of data.csv."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def __call__(self, name, symbol, since):
+        rows = self.data[(self.data['Symbol'] == symbol) & (self.data['Date'] > since)]
+        return rows.drop(columns=['SNo', 'Name', 'Symbol'], errors='ignore')
+
+
+class YFinanceFeed:
+    """Daily candles from Yahoo Finance (``<symbol>-USD`` tickers)."""
+
+    def __init__(self, market='USD'):
+        import yfinance
+        self.yfinance = yfinance
+        self.market = market
+
+    def __call__(self, name, symbol, since):
+        start = (pd.Timestamp(since).normalize() + pd.Timedelta(days=1)).date()
+        prices = self.yfinance.download(f'{symbol}-{self.market}', start=start, interval='1d',
+                                        progress=False, auto_adjust=False)
+        if isinstance(prices.columns, pd.MultiIndex):
+            prices.columns = prices.columns.get_level_values(0)
+        rows = prices[['High', 'Low', 'Open', 'Close', 'Volume']].reset_index()
+        rows['Date'] = pd.to_datetime(rows['Date']).dt.tz_localize(None).dt.normalize() + CANDLE_TIME
+        return rows[rows['Date'] > since]
+
+
+class AlphaVantageFeed:
+    """Daily candles from Alpha Vantage's digital currency endpoint."""
+
+    FIELDS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close',
+              'volume': 'Volume', 'market cap': 'Marketcap'}
+
+    def __init__(self, api_key=None, market='USD'):
+        from alpha_vantage.cryptocurrencies import CryptoCurrencies
+        api_key = api_key or os.environ.get('ALPHAVANTAGE_API_KEY')
+        self.client = CryptoCurrencies(key=api_key, output_format='pandas')
+        self.market = market
+
+    def __call__(self, name, symbol, since):
+        prices, _ = self.client.get_digital_currency_daily(symbol=symbol, market=self.market)
+        columns = {}
+        for column in prices.columns:
+            # e.g. '1a. open (USD)', '5. volume', '6. market cap (USD)'
+            field = column.split('. ', 1)[-1].replace(f' ({self.market})', '')
+            if field in self.FIELDS and self.FIELDS[field] not in columns.values():
+                columns[column] = self.FIELDS[field]
+        rows = prices[list(columns)].rename(columns=columns).astype(float)
+        rows.index.name = 'Date'
+        rows = rows.reset_index()
+        rows['Date'] = pd.to_datetime(rows['Date']).dt.normalize() + CANDLE_TIME
+        return rows[rows['Date'] > since].sort_values('Date')
+
+
+FEEDS = {'yfinance': YFinanceFeed, 'alphavantage': AlphaVantageFeed}
+
+# One ingest at a time per process: latest() -> fetch -> append -> persist
+# must not interleave, or two runs fetch and store the same candles
+_run_lock = threading.Lock()
+
+
+class Ingestor:
+    """Fetch candles newer than the last stored Date of each coin and append them.
+
+    ``service`` is the shared :class:`DataService`; with ``persist`` the rows
+    are also appended to its CSV and columnar cache.
+    """
+
+    def __init__(self, service, fetcher, persist=True):
+        self.service = service
+        self.fetcher = fetcher
+        self.persist = persist
+
+    def latest(self):
+        """``{name: (symbol, last Date)}`` for every stored coin."""
+        latest = {}
+        snapshot = self.service.index.snapshot
+        for name, (lo, hi) in snapshot.offsets.items():
+            if hi > lo:
+                last = snapshot.data.iloc[hi - 1]
+                latest[name] = (last['Symbol'], last['Date'])
+        return latest
+
+    def fetch(self):
+        frames = []
+        for name, (symbol, since) in self.latest().items():
+            rows = self.fetcher(name, symbol, since)
+            if rows is None or rows.empty:
+                continue
+            rows = rows[rows['Date'] > since].assign(Name=name, Symbol=symbol)
+            if 'Marketcap' not in rows:
+                rows['Marketcap'] = float('nan')
+            frames.append(rows)
+        if not frames:
+            return pd.DataFrame(columns=COLUMNS)
+
+        rows = pd.concat(frames, ignore_index=True).sort_values(['Name', 'Date'], kind='mergesort')
+        first = int(self.service.data['SNo'].max()) + 1
+        rows['SNo'] = range(first, first + len(rows))
+        return rows[COLUMNS].reset_index(drop=True)
+
+    def run(self):
+        """Fetch and append new candles; returns the rows that were added.
+
+        The rows are appended in memory first, which rejects candles that
+        are not newer than the stored ones, and only then written to disk.
+        """
+        with _run_lock:
+            rows = self.fetch()
+            if rows.empty:
+                return rows
+            rows = self.service.append(rows)
+            if self.persist:
+                append_rows(self.service.csv_path, rows)
+            return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Append new daily candles to data.csv')
+    parser.add_argument('--csv', default='data.csv')
+    parser.add_argument('--source', choices=sorted(FEEDS), default='yfinance')
+    args = parser.parse_args()
+
+    rows = Ingestor(DataService(args.csv), FEEDS[args.source]()).run()
+    print(f'Appended {len(rows)} rows to {args.csv}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Per-stage timings of a dashboard run.
+
+Wrap each section of a script in :meth:`Profiler.stage`; the profiler
+records its wall time, the rows it processed and the bytes it sent to the
+frontend. The records can be shown in the app and exported as a
+Prometheus text file (for the node exporter textfile collector) or
+appended to a JSON lines log.
+"""
+import json
+import os
+import time
+import weakref
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Serialized size of figures, which are cached and shown again on every
+# rerun; keyed by id since figures are unhashable
+_figure_sizes = {}
+
+
+def payload_bytes(value):
+    """Approximate bytes sent to the browser for a figure, frame or string."""
+    if value is None:
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if hasattr(value, 'to_json'):
+        ref, size = _figure_sizes.get(id(value), (None, 0))
+        if ref is None or ref() is not value:
+            size = len(value.to_json())
+            _figure_sizes[id(value)] = (weakref.ref(value, lambda _, key=id(value): _figure_sizes.pop(key, None)),
+                                        size)
+        return size
+    return 0
+
+
+class Stage:
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.rows = 0
+        self.bytes = 0
+
+    def sent(self, value, rows=None):
+        """Count ``value`` as sent to the frontend, and ``rows`` (default: its length) as processed."""
+        self.bytes += payload_bytes(value)
+        if rows is None and isinstance(value, pd.DataFrame):
+            rows = len(value)
+        self.rows += rows or 0
+        return value
+
+
+class Profiler:
+    """Collects one :class:`Stage` per ``with profiler.stage(name)`` block."""
+
+    def __init__(self):
+        self.stages = []
+        self.started = time.time()
+
+    @contextmanager
+    def stage(self, name):
+        stage = Stage(name)
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.seconds = time.perf_counter() - start
+            self.stages.append(stage)
+
+    def to_frame(self):
+        return pd.DataFrame([{'Stage': stage.name, 'Time (ms)': stage.seconds * 1000, 'Rows': stage.rows,
+                              'Payload (KB)': stage.bytes / 1024} for stage in self.stages],
+                            columns=['Stage', 'Time (ms)', 'Rows', 'Payload (KB)'])
+
+    def total_seconds(self):
+        return sum(stage.seconds for stage in self.stages)
+
+    def export_prometheus(self, path, job='cryptodash'):
+        """Write the stages of this run as Prometheus gauges, replacing ``path``."""
+        metrics = [('stage_seconds', 'Wall time of the stage in seconds', 'seconds'),
+                   ('stage_rows', 'Rows processed by the stage', 'rows'),
+                   ('stage_payload_bytes', 'Bytes sent to the frontend by the stage', 'bytes')]
+        lines = []
+        for metric, description, attribute in metrics:
+            lines.append(f'# HELP {job}_{metric} {description}')
+            lines.append(f'# TYPE {job}_{metric} gauge')
+            for stage in self.stages:
+                label = stage.name.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{job}_{metric}{{stage="{label}"}} {getattr(stage, attribute)}')
+        # The collector may read at any time, so swap the file in whole
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+
+    def export_jsonl(self, path):
+        """Append this run as one JSON line to ``path``."""
+        record = {'timestamp': self.started, 'stages': [
+            {'stage': stage.name, 'seconds': stage.seconds, 'rows': stage.rows, 'bytes': stage.bytes}
+            for stage in self.stages]}
+        with open(path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
@@ -0,0 +1,139 @@
+"""Headless batch analyses over every coin and date window.
+
+A task is one (coin, window, metric) triple. :func:`run_jobs` spreads the
+tasks over a process pool and streams each result into a
+:class:`ResultStore` as soon as its batch finishes. Workers do not receive
+the dataset with their tasks: the parent resolves the columnar cache of
+:mod:`data_store` once and hands each worker its manifest, whose per-coin
+offsets index the sorted, memory-mapped columns as they are. Every process
+reads the same pages of the OS page cache instead of a pickled or sorted
+copy. Run as a script, e.g.::
+
+    python -m cryptodash.jobs --freq Q --metrics return volatility extremes --output results.jsonl
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .analytics import extreme_moves
+from .backtest import PERIODS_PER_YEAR, max_drawdown
+from .coin_index import CoinIndex
+from .data_store import coin_offsets, ensure_cache, read_columns, read_data
+
+
+def total_return(rows):
+    close = rows['Close'].to_numpy()
+    return {'Return (%)': (close[-1] / close[0] - 1) * 100}
+
+
+def volatility(rows):
+    returns = np.diff(rows['Close'].to_numpy()) / rows['Close'].to_numpy()[:-1]
+    std = returns.std(ddof=1) if len(returns) > 1 else np.nan
+    return {'Volatility (%)': std * np.sqrt(PERIODS_PER_YEAR) * 100}
+
+
+def drawdown(rows):
+    return {'Max Drawdown (%)': max_drawdown(rows['Close'].to_numpy()) * 100}
+
+
+METRICS = {
+    'return': total_return,
+    'volatility': volatility,
+    'drawdown': drawdown,
+    'extremes': extreme_moves,
+}
+
+
+def windows(start, end, freq='M'):
+    """``(start, end)`` of every ``freq`` period between two dates."""
+    periods = pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq=freq)
+    return [(period.start_time, period.end_time) for period in periods]
+
+
+class ResultStore:
+    """Collects job results, optionally appending each one to a JSON lines file."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.rows = []
+        self._file = open(path, 'a') if path else None
+
+    def add(self, row):
+        self.rows.append(row)
+        if self._file:
+            self._file.write(json.dumps(row, default=str) + '\n')
+            self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def to_frame(self):
+        return pd.DataFrame(self.rows)
+
+
+# Coin index of a worker, opened once by its initializer
+_index = None
+
+
+def _attach(cache_dir, manifest):
+    global _index
+    # Names stay categorical over the stored codes; no per-row objects per worker
+    _index = CoinIndex(read_columns(cache_dir, manifest, categorical=True), coin_offsets(manifest))
+
+
+def _run_batch(tasks):
+    results = []
+    for name, start, end, metric in tasks:
+        rows = _index.slice(name, start, end)
+        row = {'Name': name, 'Start': str(start), 'End': str(end), 'Metric': metric, 'Rows': len(rows)}
+        if len(rows) > 1:
+            row.update(METRICS[metric](rows))
+        results.append(row)
+    return results
+
+
+def run_jobs(tasks, csv_path='data.csv', store=None, workers=None, batch_size=64):
+    """Run ``(coin, start, end, metric)`` tasks on a process pool.
+
+    Results are added to ``store`` (a new :class:`ResultStore` by default)
+    in completion order, batch by batch, and the store is returned.
+    """
+    # Build the columnar cache once here so the workers only map that version
+    cache_dir, manifest = ensure_cache(csv_path)
+    store = store or ResultStore()
+    batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+    with ProcessPoolExecutor(workers or os.cpu_count(), initializer=_attach,
+                             initargs=(cache_dir, manifest)) as executor:
+        for future in as_completed([executor.submit(_run_batch, batch) for batch in batches]):
+            for row in future.result():
+                store.add(row)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run metrics for every coin and date window')
+    parser.add_argument('--csv', default='data.csv')
+    parser.add_argument('--freq', default='M', help='window length as a pandas period alias (M, Q, Y)')
+    parser.add_argument('--metrics', nargs='+', choices=sorted(METRICS), default=sorted(METRICS))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=None, help='JSON lines file the results are appended to')
+    args = parser.parse_args()
+
+    data = read_data(args.csv)
+    tasks = [(name, start, end, metric)
+             for name in data['Name'].unique()
+             for start, end in windows(data['Date'].min(), data['Date'].max(), args.freq)
+             for metric in args.metrics]
+    store = run_jobs(tasks, args.csv, ResultStore(args.output), args.workers)
+    store.close()
+    print(f'Ran {len(store.rows)} tasks')
+
+
+if __name__ == '__main__':
+    main()
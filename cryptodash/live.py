@@ -0,0 +1,206 @@
+"""Live prices: ticks folded into candles, with deltas for the charts.
+
+A feed is an async iterator of tick batches, DataFrames with Name, Date,
+Price and Volume columns. :class:`CandleBuilder` folds each batch into
+the open candle of every coin with array operations, so the cost of an
+update depends on the batch, not on the number of coins or the history.
+:class:`LiveFeed` runs the consumer on its own asyncio loop in a
+background thread; the dashboard polls :meth:`LiveFeed.drain` on a timer
+and appends the returned rows to its charts.
+"""
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+
+CANDLE_COLUMNS = ['Name', 'Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class ReplayFeed:
+    """Replay daily candles (e.g. data.csv) as ticks, one date per batch.
+
+    Each candle becomes four ticks through the day, at its Open, High, Low
+    and Close, with the Volume spread over them. ``delay`` seconds pass
+    between batches.
+    """
+
+    def __init__(self, data, delay=0.5, start=None):
+        self.data = data if start is None else data[data['Date'] >= pd.Timestamp(start)]
+        self.delay = delay
+
+    async def __aiter__(self):
+        offsets = pd.to_timedelta(['0h', '6h', '12h', '23h59min'])
+        for date, day in self.data.groupby(self.data['Date'].dt.normalize(), sort=True):
+            n = len(day)
+            yield pd.DataFrame({
+                'Name': np.tile(day['Name'].to_numpy(), 4),
+                'Date': np.repeat((date + offsets).to_numpy(), n),
+                'Price': np.concatenate([day[column].to_numpy() for column in ('Open', 'High', 'Low', 'Close')]),
+                'Volume': np.tile(day['Volume'].to_numpy() / 4, 4),
+            })
+            await asyncio.sleep(self.delay)
+
+
+class CandleBuilder:
+    """Open candles of every coin, updated from tick batches.
+
+    The open candles live in arrays indexed by a per-coin slot, and a batch
+    is reduced with ``reduceat`` over its (coin, period) runs, so no step
+    loops over ticks or coins in Python. Ticks of a coin must arrive in
+    time order across batches.
+    """
+
+    def __init__(self, interval='1D'):
+        self.interval = pd.Timedelta(interval).value
+        self.names = pd.Index([], dtype=object)
+        # Start of each slot's open candle (ns), -1 when it has none
+        self.period = np.empty(0, dtype=np.int64)
+        self.values = np.empty((5, 0))
+
+    def slot_codes(self, names):
+        codes = self.names.get_indexer(names)
+        if (codes < 0).any():
+            new = pd.unique(names[codes < 0])
+            self.names = self.names.append(pd.Index(new, dtype=object))
+            self.period = np.concatenate([self.period, np.full(len(new), -1, dtype=np.int64)])
+            self.values = np.concatenate([self.values, np.full((5, len(new)), np.nan)], axis=1)
+            codes = self.names.get_indexer(names)
+        return codes
+
+    def frame(self, codes, periods, values):
+        return pd.DataFrame({'Name': self.names.to_numpy()[codes], 'Date': periods.astype('datetime64[ns]'),
+                             'Open': values[0], 'High': values[1], 'Low': values[2], 'Close': values[3],
+                             'Volume': values[4]}, columns=CANDLE_COLUMNS)
+
+    @property
+    def current(self):
+        """The open candle of every coin."""
+        has = np.flatnonzero(self.period >= 0)
+        return self.frame(has, self.period[has], self.values[:, has])
+
+    def update(self, ticks):
+        """Fold a batch of ticks in; returns the candles it completed."""
+        if len(ticks) == 0:
+            return pd.DataFrame(columns=CANDLE_COLUMNS)
+        codes = self.slot_codes(ticks['Name'].to_numpy())
+        times = ticks['Date'].to_numpy().astype('datetime64[ns]').astype(np.int64)
+        order = np.lexsort((times, codes))
+        codes, times = codes[order], times[order]
+        prices = ticks['Price'].to_numpy(dtype=np.float64)[order]
+        volumes = ticks['Volume'].to_numpy(dtype=np.float64)[order]
+        periods = times - times % self.interval
+
+        # One group per run of ticks with the same coin and period
+        starts = np.flatnonzero(np.r_[True, (codes[1:] != codes[:-1]) | (periods[1:] != periods[:-1])])
+        ends = np.r_[starts[1:], len(codes)] - 1
+        group_codes, group_periods = codes[starts], periods[starts]
+        groups = np.vstack([prices[starts], np.maximum.reduceat(prices, starts),
+                            np.minimum.reduceat(prices, starts), prices[ends], np.add.reduceat(volumes, starts)])
+        first = np.r_[True, group_codes[1:] != group_codes[:-1]]
+        last = np.r_[group_codes[1:] != group_codes[:-1], True]
+
+        # A coin's first group continues its open candle when they share a period
+        state_periods = self.period[group_codes]
+        same = first & (state_periods == group_periods)
+        state = self.values[:, group_codes[same]]
+        groups[0, same] = state[0]
+        groups[1, same] = np.fmax(groups[1, same], state[1])
+        groups[2, same] = np.fmin(groups[2, same], state[2])
+        groups[4, same] += state[4]
+
+        # Open candles the batch moved past are complete, as is every group but a coin's last
+        superseded = group_codes[first & ~same & (state_periods >= 0)]
+        done = ~last
+        completed = self.frame(np.r_[superseded, group_codes[done]], np.r_[self.period[superseded], group_periods[done]],
+                               np.hstack([self.values[:, superseded], groups[:, done]]))
+        self.period[group_codes[last]] = group_periods[last]
+        self.values[:, group_codes[last]] = groups[:, last]
+        return completed
+
+
+class LiveFeed:
+    """Consume ``feed`` on a background asyncio loop and buffer chart deltas.
+
+    ``subscribers`` are called with every batch of completed candles (on
+    the consumer thread), e.g. an alert engine. An exception in the
+    consumer ends it and is kept in ``error``; :meth:`stop` cancels it.
+    """
+
+    def __init__(self, feed, interval='1D'):
+        self.feed = feed
+        self.builder = CandleBuilder(interval)
+        self.subscribers = []
+        self.updates = 0
+        self._pending = []
+        self._touched = set()
+        self.error = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+        self._task = None
+        self._ready = threading.Event()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, daemon=True)
+            self._thread.start()
+        return self
+
+    def run(self):
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self.consume())
+        self._ready.set()
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self._loop.close()
+
+    def stop(self, timeout=5):
+        """Cancel the consumer and wait for its thread to end."""
+        if self._thread is None:
+            return
+        self._ready.wait(timeout)
+        try:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        except RuntimeError:
+            # The loop already finished (feed exhausted or failed)
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    async def consume(self):
+        async for ticks in self.feed:
+            with self._lock:
+                completed = self.builder.update(ticks)
+                self.updates += 1
+                if len(completed):
+                    self._pending.append(completed)
+                self._touched.update(ticks['Name'].unique())
+            if len(completed):
+                for subscriber in self.subscribers:
+                    subscriber(completed)
+
+    def drain(self):
+        """Candles completed since the last call, and the open candles of coins that changed."""
+        with self._lock:
+            completed = pd.concat(self._pending, ignore_index=True) if self._pending else \
+                pd.DataFrame(columns=CANDLE_COLUMNS)
+            current = self.builder.current
+            current = current[current['Name'].isin(self._touched)]
+            self._pending, self._touched = [], set()
+        return completed, current
+
+
+def chart_rows(candles, names, column='Close'):
+    """Wide (Date x coin) rows of ``column`` for ``st.line_chart(...).add_rows``."""
+    candles = candles[candles['Name'].isin(names)]
+    return candles.pivot_table(index='Date', columns='Name', values=column, aggfunc='last').reindex(columns=names)
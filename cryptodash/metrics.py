@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+# Derived percent-change columns shown by the dashboard
+METRIC_COLUMNS = ['Range (%)', '24h (%)', '7d (%)', 'Price Change (%)']
+
+
+def compute_metrics(data):
+    """Percent-change columns for every coin of ``data`` in one pass.
+
+    ``data`` must be sorted by (Name, Date), as ``CoinIndex.data`` is. The
+    7-day change shifts ``Open`` within each coin, so a coin's first week
+    is NaN instead of picking up the previous coin's prices.
+    """
+    high, low = data['High'], data['Low']
+    open_, close = data['Open'], data['Close']
+    open_7d = data.groupby('Name', sort=False, observed=True)['Open'].shift(7)
+    daily_change = (close - open_) / open_ * 100
+    return pd.DataFrame({
+        # Daily candles have no hourly data: this is the High/Low range of the day
+        'Range (%)': (high - low) / low * 100,
+        '24h (%)': daily_change,
+        '7d (%)': (close - open_7d) / open_7d * 100,
+        'Price Change (%)': daily_change,
+    }, index=data.index)
+
+
+def change_over(data, offset, column='Close'):
+    """Percent change of ``column`` against its value ``offset`` earlier, per coin.
+
+    For intraday bars: the reference is the last bar of the same coin at
+    or before ``Date - offset``, so '1h (%)' is a true one-hour change
+    (daily data only has the High/Low 'Range (%)'). ``data`` must be sorted by
+    (Name, Date). Rows without that much history are NaN.
+    """
+    names = data['Name'].to_numpy()
+    dates = data['Date'].to_numpy()
+    values = data[column].to_numpy(dtype='float64')
+    reference = np.full(len(data), np.nan)
+    boundaries = np.flatnonzero(np.r_[True, names[1:] != names[:-1], True])
+    for lo, hi in zip(boundaries[:-1], boundaries[1:]):
+        block = dates[lo:hi]
+        positions = np.searchsorted(block, block - pd.Timedelta(offset).to_timedelta64(), side='right') - 1
+        found = positions >= 0
+        reference[lo:hi][found] = values[lo:hi][positions[found]]
+    return pd.Series((values - reference) / reference * 100, index=data.index)
+
+
+def intraday_metrics(data):
+    """'1h (%)' and '24h (%)' of hourly or minute bars, from Close prices."""
+    return pd.DataFrame({
+        '1h (%)': change_over(data, pd.Timedelta(hours=1)),
+        '24h (%)': change_over(data, pd.Timedelta(hours=24)),
+    }, index=data.index)
@@ -0,0 +1,139 @@
+"""Time-partitioned storage for hourly and minute bars.
+
+Bars are stored per coin and per day or month, each partition in the
+columnar layout of :mod:`data_store` (``SNo.npy``, ``Date.npy`` and a
+``prices.npy`` block) under ``<root>/<coin>/<period>/``. A manifest lists
+the partitions, so a read only opens (memory-maps) the ones overlapping
+the requested range. Import a CSV in the data.csv schema, a chunk at a
+time::
+
+    python -m cryptodash.partitions synthetic.csv --root bars --partition day
+"""
+import argparse
+import json
+import os
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from .data_store import (COLUMNS, DATE_FORMAT, FLOAT_COLUMNS, CHUNK_ROWS, empty_frame, load_array,
+                         save_array)
+
+# Partition granularity -> pandas period alias
+PARTITIONS = {'day': 'D', 'month': 'M'}
+
+STORE_VERSION = 1
+MANIFEST = 'manifest.json'
+
+
+class PartitionedStore:
+    """Bars of many coins split into per-coin, per-period partitions."""
+
+    def __init__(self, root, partition='month'):
+        self.root = root
+        try:
+            with open(os.path.join(root, MANIFEST)) as f:
+                self.manifest = json.load(f)
+        except OSError:
+            self.manifest = {'version': STORE_VERSION, 'partition': partition, 'coins': {}}
+        self.freq = PARTITIONS[self.manifest['partition']]
+
+    @property
+    def names(self):
+        return list(self.manifest['coins'])
+
+    def path(self, name, key):
+        return os.path.join(self.root, quote(name, safe=''), key)
+
+    def partitions(self, name, start=None, end=None):
+        """Keys of the partitions of ``name`` that overlap ``[start, end]``."""
+        keys = self.manifest['coins'].get(name, {}).get('partitions', [])
+        periods = [pd.Period(key, self.freq) for key in keys]
+        return [key for key, period in zip(keys, periods)
+                if (start is None or period.end_time >= pd.Timestamp(start))
+                and (end is None or period.start_time <= pd.Timestamp(end))]
+
+    def read_partition(self, name, key, start=None, end=None):
+        directory = self.path(name, key)
+        dates = load_array(directory, 'Date')
+        lo = 0 if start is None else int(np.searchsorted(dates, pd.Timestamp(start).to_datetime64(), side='left'))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, pd.Timestamp(end).to_datetime64(),
+                                                                    side='right'))
+        prices = load_array(directory, 'prices')[:, lo:hi]
+        data = pd.DataFrame(prices.T, columns=FLOAT_COLUMNS, copy=False)
+        data.insert(0, 'SNo', load_array(directory, 'SNo')[lo:hi])
+        data.insert(1, 'Name', name)
+        data.insert(2, 'Symbol', self.manifest['coins'][name]['symbol'])
+        data.insert(3, 'Date', dates[lo:hi])
+        return data
+
+    def read(self, names=None, start=None, end=None):
+        """Bars of ``names`` (all coins when None) with ``start <= Date <= end``.
+
+        Only the partitions overlapping the range are opened; the result is
+        sorted by (Name, Date) like ``CoinIndex.data``.
+        """
+        pieces = [self.read_partition(name, key, start, end)
+                  for name in (self.names if names is None else names)
+                  for key in self.partitions(name, start, end)]
+        pieces = [piece for piece in pieces if len(piece)]
+        return pd.concat(pieces, ignore_index=True) if pieces else empty_frame()
+
+    def write(self, data):
+        """Add bars (data.csv columns) to the store, merging with existing partitions.
+
+        Rows for a period that is already stored are merged in by date; a
+        bar with the same date replaces the stored one.
+        """
+        data = data[COLUMNS]
+        periods = data['Date'].dt.to_period(self.freq).astype(str)
+        for (name, key), rows in data.groupby([data['Name'], periods], sort=False):
+            coin = self.manifest['coins'].setdefault(name, {'symbol': rows['Symbol'].iloc[0], 'partitions': []})
+            if key in coin['partitions']:
+                rows = pd.concat([self.read_partition(name, key), rows])
+            rows = rows.sort_values('Date', kind='mergesort').drop_duplicates('Date', keep='last')
+            directory = self.path(name, key)
+            os.makedirs(directory, exist_ok=True)
+            save_array(os.path.join(directory, 'SNo.npy'), rows['SNo'].to_numpy(dtype='int64'))
+            save_array(os.path.join(directory, 'Date.npy'), rows['Date'].to_numpy(dtype='datetime64[ns]'))
+            save_array(os.path.join(directory, 'prices.npy'),
+                       np.ascontiguousarray(rows[FLOAT_COLUMNS].to_numpy(dtype='float64').T))
+            if key not in coin['partitions']:
+                coin['partitions'] = sorted(coin['partitions'] + [key])
+        self.save_manifest()
+
+    def save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = os.path.join(self.root, MANIFEST + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, os.path.join(self.root, MANIFEST))
+
+
+def import_csv(csv_path, store, chunk_rows=CHUNK_ROWS):
+    """Write a CSV in the data.csv schema into ``store``, ``chunk_rows`` at a time."""
+    dtypes = {'SNo': 'int64', 'Name': object, 'Symbol': object, 'Date': object}
+    dtypes.update((column, 'float64') for column in FLOAT_COLUMNS)
+    rows = 0
+    for chunk in pd.read_csv(csv_path, dtype=dtypes, chunksize=chunk_rows):
+        chunk['Date'] = pd.to_datetime(chunk['Date'], format=DATE_FORMAT)
+        store.write(chunk)
+        rows += len(chunk)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import bars into a time-partitioned store')
+    parser.add_argument('csv')
+    parser.add_argument('--root', default='bars')
+    parser.add_argument('--partition', choices=sorted(PARTITIONS), default='month')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    rows = import_csv(args.csv, PartitionedStore(args.root, args.partition), args.chunk_rows)
+    print(f'Imported {rows} rows into {args.root}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+# Candle intervals offered by the dashboard and their pandas period aliases
+FREQUENCIES = {
+    "Daily": None,
+    "Weekly": 'W',
+    "Monthly": 'M',
+    "Quarterly": 'Q',
+}
+
+# How each column is combined into a bar
+AGGREGATIONS = {
+    'Symbol': 'first',
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum',
+    'Marketcap': 'last',
+}
+
+
+def resample_ohlcv(data, freq):
+    """Aggregate daily rows into OHLCV bars of period ``freq``, per coin.
+
+    ``data`` must be sorted by (Name, Date). Each bar is stamped with the
+    start of its period.
+    """
+    periods = data['Date'].dt.to_period(freq).rename('Date')
+    bars = data.groupby([data['Name'], periods], sort=False, observed=True).agg(AGGREGATIONS).reset_index()
+    bars['Date'] = bars['Date'].dt.start_time
+    return bars
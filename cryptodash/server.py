@@ -0,0 +1,236 @@
+"""HTTP/JSON endpoint for the dashboard numbers.
+
+A small asyncio HTTP/1.1 server (keep-alive, GET only) over one shared
+:class:`~cryptodash.data_service.DataService`. Responses are cached by
+request and data version, and carry an ETag hashed from their content,
+so repeated requests are answered from memory or with ``304 Not
+Modified``, also across restarts.
+Endpoints::
+
+    GET /coins
+    GET /version
+    GET /ohlcv?name=Bitcoin&start=2021-01-01&end=2021-03-01&time_frame=7+days
+    GET /extremes?name=Bitcoin&start=...&end=...
+    GET /performers?parameter=Volume&stat=mean&n=3
+
+Add ``format=arrow`` (or send ``Accept: application/vnd.apache.arrow.stream``)
+to get table endpoints as an Arrow IPC stream; that needs pyarrow.
+Run with ``python -m cryptodash.server --port 8765``.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .analytics import compare, extreme_moves, filter_window, top_and_worst
+from .data_service import DataService
+
+ARROW_TYPE = 'application/vnd.apache.arrow.stream'
+JSON_TYPE = 'application/json'
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 406: 'Not Acceptable'}
+
+OHLCV_COLUMNS = ['Name', 'Symbol', 'Date', 'Open', 'High', 'Low', 'Close', 'Volume', 'Marketcap',
+                 'Range (%)', '24h (%)', '7d (%)', 'Price Change (%)']
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def to_arrow(frame):
+    try:
+        import pyarrow
+    except ImportError:
+        raise RequestError(406, 'Arrow output needs pyarrow')
+    table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def json_default(value):
+    # NumPy scalars (float32 prices of the compact schema) as JSON numbers
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def json_body(value):
+    return json.dumps(value, default=json_default).encode()
+
+
+class MetricsServer:
+    """Request handling and response cache; :meth:`handle` does no I/O."""
+
+    def __init__(self, service, cache_size=1024):
+        self.service = service
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+        self.routes = {
+            '/coins': self.coins,
+            '/version': self.version,
+            '/ohlcv': self.ohlcv,
+            '/extremes': self.extremes,
+            '/performers': self.performers,
+        }
+
+    def coins(self, query):
+        return {'coins': list(self.service.names)}
+
+    def version(self, query):
+        return {'version': self.service.version}
+
+    def window(self, query):
+        name = query.get('name')
+        if name is not None and name not in self.service.index.offsets:
+            raise RequestError(404, f'unknown coin {name!r}')
+        try:
+            rows, _ = filter_window(self.service, name, query.get('start'), query.get('end'),
+                                    query.get('time_frame'))
+        except (ValueError, KeyError) as e:
+            raise RequestError(400, f'bad filter: {e}')
+        return rows
+
+    def ohlcv(self, query):
+        return self.window(query)[OHLCV_COLUMNS]
+
+    def extremes(self, query):
+        rows = self.window(query)
+        if rows.empty:
+            raise RequestError(404, 'no rows in range')
+        return extreme_moves(rows)
+
+    def performers(self, query):
+        parameter = query.get('parameter', 'Volume')
+        try:
+            values = compare(self.service, parameter, query.get('stat', 'mean'))
+            n = int(query.get('n', 3))
+        except (KeyError, ValueError) as e:
+            raise RequestError(400, f'bad parameter: {e}')
+        top, worst = top_and_worst(values, n)
+        return {'parameter': parameter, 'top': top.to_dict(), 'worst': worst.to_dict()}
+
+    def render(self, path, query, arrow):
+        result = self.routes[path](query)
+        if isinstance(result, pd.DataFrame):
+            if arrow:
+                return to_arrow(result), ARROW_TYPE
+            return result.to_json(orient='records', date_format='iso').encode(), JSON_TYPE
+        return json_body(result), JSON_TYPE
+
+    def handle(self, method, target, headers):
+        """Return ``(status, headers, body)`` for one request."""
+        if method not in ('GET', 'HEAD'):
+            return self.error(405, 'only GET is supported')
+        url = urlsplit(target)
+        if url.path not in self.routes:
+            return self.error(404, f'no endpoint {url.path}')
+        query = dict(parse_qsl(url.query))
+        arrow = query.pop('format', None) == 'arrow' or ARROW_TYPE in headers.get('accept', '')
+
+        key = (url.path, tuple(sorted(query.items())), arrow, self.service.version)
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is not None:
+                self._responses.move_to_end(key)
+                self.hits += 1
+        if cached is None:
+            try:
+                body, content_type = self.render(url.path, query, arrow)
+            except RequestError as e:
+                return self.error(e.status, str(e))
+            # From the response itself: a counter like service.version restarts
+            # with the process, so it cannot tell old data from new
+            etag = '"%s"' % hashlib.sha1(content_type.encode() + b'\0' + body).hexdigest()[:20]
+            cached = (body, content_type, etag)
+            with self._lock:
+                self.misses += 1
+                self._responses[key] = cached
+                while len(self._responses) > self.cache_size:
+                    self._responses.popitem(last=False)
+
+        body, content_type, etag = cached
+        response_headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if etag in headers.get('if-none-match', ''):
+            return 304, response_headers, b''
+        response_headers['Content-Type'] = content_type
+        # HEAD reports the length a GET would send
+        response_headers['Content-Length'] = str(len(body))
+        return 200, response_headers, b'' if method == 'HEAD' else body
+
+    def error(self, status, message):
+        return status, {'Content-Type': JSON_TYPE}, json_body({'error': message})
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0) or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                status, response_headers, body = self.handle(method, target, headers)
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                response_headers.setdefault('Content-Length', str(len(body)))
+                response_headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+                head = f'HTTP/1.1 {status} {REASONS.get(status, "")}\r\n' + ''.join(
+                    f'{name}: {value}\r\n' for name, value in response_headers.items()) + '\r\n'
+                writer.write(head.encode('latin-1') + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        server = await asyncio.start_server(self.serve_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the dashboard metrics over HTTP')
+    parser.add_argument('--csv', default='data.csv')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--compact', action='store_true', help='categorical names and float32 prices')
+    parser.add_argument('--coins', nargs='+', help='serve only these coins (default: all)')
+    parser.add_argument('--since', help='serve only candles from this date on')
+    args = parser.parse_args()
+
+    server = MetricsServer(DataService(args.csv, compact=args.compact, names=args.coins, start=args.since))
+    print(f'Serving on http://{args.host}:{args.port}')
+    asyncio.run(server.serve(args.host, args.port))
+
+
+if __name__ == '__main__':
+    main()
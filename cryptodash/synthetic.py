@@ -0,0 +1,136 @@
+"""Synthetic price data in the data.csv schema, for load testing.
+
+Every coin follows a geometric Brownian motion with its own starting
+price, drift and volatility; Open is the previous Close, High and Low add
+an intrabar excursion, and Marketcap and Volume follow the price. Rows are
+generated and written in chunks of a bounded number of rows, so the
+output size is not limited by memory::
+
+    python -m cryptodash.synthetic --coins 500 --freq 1min --start 2021-01-01 --end 2021-07-01 \\
+        --output synthetic.parquet
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from .data_store import COLUMNS, DATE_FORMAT
+from .ingest import CANDLE_TIME
+
+YEAR = pd.Timedelta(days=365)
+
+CHUNK_ROWS = 1_000_000
+
+
+def coin_specs(n_coins, seed=0):
+    """Name, Symbol and GBM parameters (annualized) of ``n_coins`` coins."""
+    rng = np.random.default_rng(seed)
+    width = len(str(n_coins))
+    return pd.DataFrame({
+        'Name': [f'Synthetic Coin {i:0{width}d}' for i in range(1, n_coins + 1)],
+        'Symbol': [f'SYN{i:0{width}d}' for i in range(1, n_coins + 1)],
+        'Price': 10 ** rng.uniform(-3, 4, n_coins),
+        'Drift': rng.normal(0.3, 0.5, n_coins),
+        'Volatility': rng.uniform(0.5, 1.5, n_coins),
+        'Supply': 10 ** rng.uniform(6, 11, n_coins),
+        # Daily traded fraction of the market cap
+        'Turnover': rng.uniform(0.01, 0.2, n_coins),
+    })
+
+
+def generate(n_coins=100, freq='1D', start='2015-01-01', end='2021-07-06', seed=0, chunk_rows=CHUNK_ROWS):
+    """Yield frames with the columns of data.csv, at most ``chunk_rows`` rows each.
+
+    ``freq`` must be a fixed interval (``'1D'``, ``'1H'``, ``'1min'``...).
+    Rows come coin by coin and in date order within a coin, like data.csv.
+    """
+    step = pd.Timedelta(freq)
+    start = pd.Timestamp(start) + (CANDLE_TIME if step >= pd.Timedelta(days=1) else pd.Timedelta(0))
+    n_periods = int((pd.Timestamp(end) - pd.Timestamp(start).normalize()) // step) + 1
+    specs = coin_specs(n_coins, seed)
+    rng = np.random.default_rng(seed + 1)
+    dt = step / YEAR
+    coins_per_chunk = max(chunk_rows // n_periods, 1)
+    periods_per_chunk = min(n_periods, chunk_rows)
+    sno = 1
+
+    for first in range(0, n_coins, coins_per_chunk):
+        block = specs.iloc[first:first + coins_per_chunk]
+        k = len(block)
+        drift = ((block['Drift'] - block['Volatility'] ** 2 / 2) * dt).to_numpy()[:, None]
+        shock = (block['Volatility'] * np.sqrt(dt)).to_numpy()[:, None]
+        last_close = block['Price'].to_numpy()[:, None]
+        for lo in range(0, n_periods, periods_per_chunk):
+            m = min(periods_per_chunk, n_periods - lo)
+            log_returns = drift + shock * rng.standard_normal((k, m))
+            close = last_close * np.exp(np.cumsum(log_returns, axis=1))
+            open_ = np.concatenate([last_close, close[:, :-1]], axis=1)
+            last_close = close[:, -1:]
+            excursion = shock * np.abs(rng.standard_normal((2, k, m))) / 2
+            high = np.maximum(open_, close) * np.exp(excursion[0])
+            low = np.minimum(open_, close) * np.exp(-excursion[1])
+            marketcap = close * block['Supply'].to_numpy()[:, None]
+            volume = marketcap * (block['Turnover'].to_numpy()[:, None] * step / pd.Timedelta(days=1)
+                                  * rng.lognormal(0, 0.5, (k, m)))
+
+            dates = start.to_datetime64() + np.arange(lo, lo + m) * step.to_timedelta64()
+            chunk = pd.DataFrame({
+                'SNo': np.arange(sno, sno + k * m),
+                'Name': np.repeat(block['Name'].to_numpy(), m),
+                'Symbol': np.repeat(block['Symbol'].to_numpy(), m),
+                'Date': np.tile(dates, k),
+                'High': high.ravel(), 'Low': low.ravel(), 'Open': open_.ravel(), 'Close': close.ravel(),
+                'Volume': volume.ravel(), 'Marketcap': marketcap.ravel(),
+            }, columns=COLUMNS)
+            sno += len(chunk)
+            yield chunk
+
+
+def write_csv(path, chunks):
+    """Write ``chunks`` to one CSV readable by :func:`data_store.parse_csv`; returns the row count."""
+    rows = 0
+    with open(path, 'w', newline='') as f:
+        for chunk in chunks:
+            chunk.to_csv(f, header=rows == 0, index=False, date_format=DATE_FORMAT)
+            rows += len(chunk)
+    return rows
+
+
+def write_parquet(path, chunks):
+    """Write ``chunks`` as row groups of one Parquet file (needs pyarrow); returns the row count."""
+    import pyarrow
+    import pyarrow.parquet
+
+    rows, writer = 0, None
+    try:
+        for chunk in chunks:
+            table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic candles in the data.csv schema')
+    parser.add_argument('--coins', type=int, default=100)
+    parser.add_argument('--freq', default='1D', help='bar interval, e.g. 1D, 1H, 1min')
+    parser.add_argument('--start', default='2015-01-01')
+    parser.add_argument('--end', default='2021-07-06')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--output', default='synthetic.csv', help='.csv or .parquet')
+    args = parser.parse_args()
+
+    chunks = generate(args.coins, args.freq, args.start, args.end, args.seed, args.chunk_rows)
+    write = write_parquet if args.output.endswith('.parquet') else write_csv
+    rows = write(args.output, chunks)
+    print(f'Wrote {rows} rows to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
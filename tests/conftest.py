@@ -0,0 +1,33 @@
+import mmap
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cryptodash.synthetic import generate, write_csv
+
+CUTOFF = pd.Timestamp('2021-05-01')
+
+
+@pytest.fixture(scope='session')
+def candles():
+    """Three synthetic coins of daily candles in the data.csv schema."""
+    return pd.concat(generate(n_coins=3, start='2021-01-01', end='2021-06-30', seed=1), ignore_index=True)
+
+
+@pytest.fixture
+def csv_path(tmp_path, candles):
+    """A data.csv with the candles up to ``CUTOFF``."""
+    path = tmp_path / 'data.csv'
+    write_csv(path, [candles[candles['Date'] < CUTOFF]])
+    return str(path)
+
+
+def is_memory_mapped(values):
+    """Whether ``values`` (an array or Series) is a view of a memory map."""
+    base = getattr(values, 'values', values)
+    while base is not None:
+        if isinstance(base, (mmap.mmap, np.memmap)):
+            return True
+        base = getattr(base, 'base', None)
+    return False
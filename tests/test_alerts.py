@@ -0,0 +1,65 @@
+import numpy as np
+
+from cryptodash.alerts import AlertEngine, ma_cross, move, volume_spike
+from cryptodash.jobs import ResultStore
+
+from conftest import CUTOFF
+
+
+def brute_force(candles, rules, since):
+    """Alerts of ``rules`` on candles from ``since`` on, one candle at a time."""
+    alerts = []
+    for name, rows in candles.groupby('Name', sort=False):
+        close, volume, dates = rows['Close'].tolist(), rows['Volume'].tolist(), rows['Date'].tolist()
+        for i in range(1, len(rows)):
+            if dates[i] < since:
+                continue
+            for rule in rules:
+                if rule.kind == 'move':
+                    change = (close[i] / close[i - 1] - 1) * 100
+                    if abs(change) > rule.threshold:
+                        alerts.append((rule.name, name, dates[i], change))
+                elif rule.kind == 'cross' and i >= rule.window:
+                    gap = close[i] - sum(close[i - rule.window + 1:i + 1]) / rule.window
+                    before = close[i - 1] - sum(close[i - rule.window:i]) / rule.window
+                    if gap * before < 0:
+                        alerts.append((rule.name, name, dates[i], gap))
+                elif rule.kind == 'volume' and i >= rule.window:
+                    ratio = volume[i] / (sum(volume[i - rule.window:i]) / rule.window)
+                    if ratio > rule.threshold:
+                        alerts.append((rule.name, name, dates[i], ratio))
+    return sorted(alerts, key=lambda alert: alert[:3])
+
+
+def as_tuples(rows):
+    return sorted(((row['Rule'], row['Name'], row['Date'], row['Value']) for row in rows), key=lambda alert: alert[:3])
+
+
+def assert_same(got, expected):
+    assert [alert[:3] for alert in got] == [alert[:3] for alert in expected]
+    np.testing.assert_allclose([alert[3] for alert in got], [alert[3] for alert in expected])
+
+
+def test_incremental_alerts_match_brute_force(candles):
+    rules = [move(3), move(6), ma_cross(10), ma_cross(20), volume_spike(1.5, 10), volume_spike(2)]
+    sink = ResultStore()
+    engine = AlertEngine(rules, sink=sink)
+    engine.warm(candles[candles['Date'] < CUTOFF])
+    for _, day in candles[candles['Date'] >= CUTOFF].groupby('Date'):
+        engine.update(day)
+
+    expected = brute_force(candles, rules, CUTOFF)
+    assert len(expected) > 0
+    assert_same(as_tuples(sink.rows), expected)
+
+
+def test_set_rules_keeps_state(candles):
+    sink = ResultStore()
+    engine = AlertEngine([move(3)], sink=sink, depth=40)
+    engine.warm(candles[candles['Date'] < CUTOFF])
+
+    rules = [move(5), ma_cross(30), volume_spike(1.5, 20)]
+    engine.set_rules(rules)
+    engine.update(candles[candles['Date'] >= CUTOFF])
+    assert_same(as_tuples(sink.rows), brute_force(candles, rules, CUTOFF))
+    assert {row['Rule'] for row in sink.rows} <= {rule.name for rule in rules}
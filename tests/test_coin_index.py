@@ -0,0 +1,22 @@
+from cryptodash.coin_index import CoinIndex
+from cryptodash.data_service import DataService
+
+from conftest import CUTOFF
+
+
+def test_views_during_an_append_see_one_version(csv_path, candles):
+    service = DataService(csv_path)
+    # Coin 3's block shifts when coins 1 and 2 grow
+    name = 'Synthetic Coin 3'
+    seen = []
+
+    class Probe(CoinIndex):
+        # Another session looks the coin up after every attribute the append sets
+        def __setattr__(self, attr, value):
+            super().__setattr__(attr, value)
+            seen.append(service.view(name)['Name'].unique().tolist())
+
+    service.index.__class__ = Probe
+    service.append(candles[candles['Date'] >= CUTOFF])
+    assert seen and all(names == [name] for names in seen)
+    assert len(service.view(name)) == (candles['Name'] == name).sum()
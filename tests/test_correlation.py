@@ -0,0 +1,15 @@
+import datetime
+
+import numpy as np
+
+from cryptodash.correlation import CorrelationMatrix
+
+
+def test_at_picks_the_window_ending_on_the_selected_day(candles):
+    correlations = CorrelationMatrix(candles)
+    last = correlations.dates[-1]
+    # The slider passes a midnight date; the candle of that day is stamped 23:59
+    for date in (last.date(), datetime.datetime.combine(last.date(), datetime.time())):
+        np.testing.assert_array_equal(correlations.at(30, date).to_numpy(), correlations.rolling(30)[-1])
+    np.testing.assert_array_equal(correlations.at(30, correlations.dates[40].date()).to_numpy(),
+                                  correlations.rolling(30)[40])
@@ -0,0 +1,21 @@
+import os
+
+import pandas as pd
+
+from cryptodash.data_service import DataService
+from cryptodash.data_store import COLUMNS, default_cache_dir
+
+
+def test_subset_service_matches_full_view(csv_path):
+    window = dict(start='2021-02-01', end='2021-03-31')
+    name = 'Synthetic Coin 2'
+    # No cache yet: the CSV is scanned in chunks, and no cache is built
+    from_csv = DataService(csv_path, names=[name], **window)
+    assert not os.path.exists(default_cache_dir(csv_path))
+
+    full = DataService(csv_path)
+    from_cache = DataService(csv_path, names=[name], **window)
+    expected = full.view(name, window['start'], window['end'])[COLUMNS].reset_index(drop=True)
+    for subset in (from_csv, from_cache):
+        assert subset.names == [name]
+        pd.testing.assert_frame_equal(subset.data[COLUMNS].reset_index(drop=True), expected, check_dtype=False)
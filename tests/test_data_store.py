@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+
+from cryptodash.coin_index import CoinIndex
+from cryptodash.data_store import (COLUMNS, append_rows, coin_offsets, columns_dir, ensure_cache, read_columns,
+                                   read_data)
+from cryptodash.synthetic import write_csv
+
+from conftest import CUTOFF
+
+
+def test_cache_versions_switch_with_the_manifest(csv_path, candles):
+    new = candles[candles['Date'] >= CUTOFF]
+    first_batch, second_batch = new[new['Date'] < '2021-06-01'], new[new['Date'] >= '2021-06-01']
+    cache_dir, first = ensure_cache(csv_path)
+
+    second = append_rows(csv_path, first_batch)
+    # A reader still holding the replaced manifest reads that whole version
+    assert len(read_columns(cache_dir, first)) == first['rows']
+    assert second['rows'] == first['rows'] + len(first_batch)
+
+    third = append_rows(csv_path, second_batch)
+    assert not os.path.exists(columns_dir(cache_dir, first))
+    assert sorted(os.listdir(cache_dir)) == sorted(['manifest.json', second['columns'], third['columns']])
+    assert len(read_data(csv_path)) == len(candles)
+
+
+def test_appended_rows_join_their_coin_block(tmp_path, candles):
+    path = str(tmp_path / 'data.csv')
+    # Coin 1 is new to the cache and sorts before the stored coins
+    stored = candles[(candles['Date'] < CUTOFF) & (candles['Name'] != 'Synthetic Coin 1')]
+    new = candles[candles['Date'] >= CUTOFF]
+    write_csv(path, [stored])
+    ensure_cache(path)
+    manifest = append_rows(path, new.sample(frac=1, random_state=0))
+
+    data = read_data(path)
+    expected = CoinIndex(pd.concat([stored, new])).data
+    pd.testing.assert_frame_equal(data[COLUMNS], expected[COLUMNS].reset_index(drop=True))
+    assert list(coin_offsets(manifest)) == ['Synthetic Coin 2', 'Synthetic Coin 3', 'Synthetic Coin 1']
+    assert CoinIndex(data).offsets == coin_offsets(manifest)
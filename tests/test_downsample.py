@@ -0,0 +1,18 @@
+import numpy as np
+
+from cryptodash.downsample import segmented_indices, segmented_ohlc_buckets
+
+
+def test_coins_are_downsampled_separately(candles):
+    x, y = candles['Date'].to_numpy(), candles['Close'].to_numpy()
+    keep = segmented_indices(x, y, 60)
+
+    assert len(keep) <= 60
+    assert (np.diff(keep) > 0).all()
+    # Every coin keeps its own first and last candle
+    for _, rows in candles.groupby('Name').indices.items():
+        assert rows[0] in keep and rows[-1] in keep
+
+    dates = segmented_ohlc_buckets(x, *(candles[c].to_numpy() for c in ('Open', 'High', 'Low', 'Close')), 60)[0]
+    assert len(dates) <= 60
+    assert (np.diff(dates) < np.timedelta64(0)).sum() == candles['Name'].nunique() - 1
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from cryptodash.formatting import format_significant, format_usd
+
+
+def format_value(value):
+    # The per-cell formatter the tables used before format_usd
+    if value >= 1e9:
+        return f'{value/1e9:.2f}B USD'
+    elif value >= 1e6:
+        return f'{value/1e6:.2f}M USD'
+    else:
+        return f'{value:.2f} USD'
+
+
+def test_format_usd_matches_format_value(candles):
+    rng = np.random.default_rng(0)
+    values = np.concatenate([
+        10 ** rng.uniform(-3, 13, 20000),
+        np.round(rng.uniform(0, 1e4, 5000), 3),
+        # Halves and scale boundaries, where rounding is easiest to get wrong
+        np.arange(0, 1000) / 1000 + 0.005, [0.0, 0.125, 0.375, 999999.995, 1e6, 1e9 - 1, 1e9, 1e15],
+        -10 ** rng.uniform(-3, 7, 1000),
+        candles['Volume'], candles['Marketcap'],
+    ])
+    series = pd.Series(values, index=np.arange(len(values))[::-1])
+
+    formatted = format_usd(series)
+    assert formatted.index.equals(series.index)
+    assert formatted.tolist() == series.apply(format_value).tolist()
+
+
+def test_format_significant_matches_g_format():
+    rng = np.random.default_rng(1)
+    values = np.concatenate([10 ** rng.uniform(-6, 6, 20000) * rng.choice([-1, 1], 20000),
+                             [0.0, -0.0, 9.995, 9.9949, 0.00012345, 999.5, np.nan, np.inf]])
+    assert format_significant(values, 3, ' USD').tolist() == [f'{value:.3g} USD' for value in values]
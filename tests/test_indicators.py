@@ -0,0 +1,17 @@
+import pandas as pd
+
+from cryptodash.indicators import IndicatorEngine
+
+
+def test_extend_matches_a_full_recompute(candles):
+    last_days = candles.groupby('Name').cumcount(ascending=False) < 30
+    # Coin 3 has no history before the split: its state starts in extend()
+    head = candles[~last_days & (candles['Name'] != 'Synthetic Coin 3')]
+    tail = candles[last_days | (candles['Name'] == 'Synthetic Coin 3')]
+
+    engine = IndicatorEngine(head)
+    new = engine.extend(tail.sample(frac=1, random_state=0))
+    full = IndicatorEngine(candles).values
+
+    assert sorted(new.index) == sorted(tail.index)
+    pd.testing.assert_frame_equal(engine.values.sort_index(), full.sort_index(), check_exact=False, rtol=1e-9)
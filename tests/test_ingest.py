@@ -0,0 +1,51 @@
+import threading
+
+import pandas as pd
+
+from cryptodash.coin_index import CoinIndex
+from cryptodash.data_service import DataService
+from cryptodash.data_store import COLUMNS, read_data
+from cryptodash.ingest import FrameFeed, Ingestor
+
+from conftest import CUTOFF, is_memory_mapped
+
+
+def test_run_appends_newer_candles(csv_path, candles):
+    service = DataService(csv_path)
+    rows = Ingestor(service, FrameFeed(candles)).run()
+
+    expected = candles[candles['Date'] >= CUTOFF]
+    assert len(rows) == len(expected)
+    assert len(service.data) == len(candles)
+    assert service.version == 1
+    stored = read_data(csv_path).sort_values(['Name', 'Date'], kind='mergesort').reset_index(drop=True)
+    pd.testing.assert_frame_equal(stored[COLUMNS], service.data[COLUMNS].reset_index(drop=True),
+                                  check_dtype=False)
+
+    # Nothing newer left to fetch
+    assert Ingestor(service, FrameFeed(candles)).run().empty
+    assert len(read_data(csv_path)) == len(candles)
+
+
+def test_concurrent_runs_store_candles_once(csv_path, candles):
+    service = DataService(csv_path)
+    added = []
+    threads = [threading.Thread(target=lambda: added.append(len(Ingestor(service, FrameFeed(candles)).run())))
+               for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(added) == [0, (candles['Date'] >= CUTOFF).sum()]
+    assert len(read_data(csv_path)) == len(service.data) == len(candles)
+
+
+def test_cache_stays_sorted_and_mapped_after_run(csv_path, candles):
+    Ingestor(DataService(csv_path), FrameFeed(candles)).run()
+
+    data = read_data(csv_path)
+    # Already sorted by (Name, Date): the index keeps the mapped frame
+    assert CoinIndex(data).data is data
+    assert is_memory_mapped(data['Close'])
+    assert is_memory_mapped(DataService(csv_path).view('Synthetic Coin 2')['Close'])
@@ -0,0 +1,26 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from cryptodash import jobs
+from cryptodash.data_store import ensure_cache
+
+from conftest import is_memory_mapped
+
+
+def worker_frame():
+    data = jobs._index.data
+    return (is_memory_mapped(data['Close']), data['Name'].dtype.name,
+            len(jobs._index.slice('Synthetic Coin 2', '2021-02-01', '2021-02-28 23:59')))
+
+
+def test_workers_index_the_mapped_cache(csv_path):
+    with ProcessPoolExecutor(1, initializer=jobs._attach, initargs=ensure_cache(csv_path)) as executor:
+        assert executor.submit(worker_frame).result() == (True, 'category', 28)
+
+
+def test_run_jobs(csv_path):
+    tasks = [(name, '2021-02-01', '2021-02-28 23:59', metric) for name in ('Synthetic Coin 1', 'Synthetic Coin 3')
+             for metric in ('return', 'extremes')]
+    rows = jobs.run_jobs(tasks, csv_path, workers=2, batch_size=1).to_frame()
+    assert len(rows) == 4
+    assert (rows['Rows'] == 28).all()
+    assert rows[['Return (%)', 'Largest Increase (%)']].notna().sum().tolist() == [2, 2]
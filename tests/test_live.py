@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+
+from cryptodash.live import CandleBuilder, LiveFeed, ReplayFeed
+
+
+def test_replay_rebuilds_daily_candles(candles):
+    async def replay():
+        builder, completed = CandleBuilder('1D'), []
+        async for ticks in ReplayFeed(candles, delay=0):
+            # Split each batch in time order, as a feed would deliver it
+            ticks = ticks.sort_values('Date', kind='mergesort')
+            for part in np.array_split(np.arange(len(ticks)), 3):
+                completed.append(builder.update(ticks.iloc[part]))
+        return builder, pd.concat(completed, ignore_index=True)
+
+    builder, completed = asyncio.run(replay())
+    expected = candles.assign(Date=candles['Date'].dt.normalize())
+    rebuilt = pd.concat([completed, builder.current]).merge(expected, on=['Name', 'Date'], suffixes=('', ' daily'))
+    assert len(rebuilt) == len(candles)
+    for column in ('Open', 'High', 'Low', 'Close', 'Volume'):
+        np.testing.assert_allclose(rebuilt[column], rebuilt[column + ' daily'])
+
+
+def test_empty_batch_is_ignored():
+    builder = CandleBuilder('1D')
+    assert builder.update(pd.DataFrame(columns=['Name', 'Date', 'Price', 'Volume'])).empty
+    assert builder.current.empty
+
+
+def test_stop_cancels_the_consumer(candles):
+    live = LiveFeed(ReplayFeed(candles, delay=0.05)).start()
+    time.sleep(0.3)
+    live.stop()
+    assert not live.running and live.error is None
+    updates = live.updates
+    assert 0 < updates < candles['Date'].nunique()
+    time.sleep(0.2)
+    assert live.updates == updates
+    completed, _ = live.drain()
+    assert len(completed)
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from cryptodash.analytics import intraday_window
+from cryptodash.partitions import PartitionedStore
+from cryptodash.synthetic import generate
+
+
+def test_intraday_window_reads_overlapping_partitions(tmp_path):
+    bars = pd.concat(generate(n_coins=2, freq='60min', start='2021-01-01', end='2021-01-05', seed=3), ignore_index=True)
+    store = PartitionedStore(str(tmp_path / 'bars'), partition='day')
+    store.write(bars)
+    name = bars['Name'].iloc[0]
+    assert store.partitions(name, '2021-01-03 12:00', '2021-01-04') == ['2021-01-03', '2021-01-04']
+
+    window = intraday_window(store, name, '2021-01-03 12:00', '2021-01-04 11:00')
+    assert window['Date'].min() == pd.Timestamp('2021-01-03 12:00')
+    assert window['Date'].max() == pd.Timestamp('2021-01-04 11:00')
+
+    close = bars[bars['Name'] == name].set_index('Date')['Close']
+    expected_1h = (close / close.shift(1) - 1) * 100
+    expected_24h = (close / close.shift(24) - 1) * 100
+    np.testing.assert_allclose(window['1h (%)'], expected_1h[window['Date']].to_numpy())
+    np.testing.assert_allclose(window['24h (%)'], expected_24h[window['Date']].to_numpy())
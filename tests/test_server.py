@@ -0,0 +1,118 @@
+import asyncio
+import http.client
+import json
+import threading
+from urllib.parse import urlencode
+
+import pytest
+
+from cryptodash.data_service import DataService
+from cryptodash.ingest import FrameFeed, Ingestor
+from cryptodash.server import MetricsServer
+
+
+@pytest.fixture
+def serve():
+    """``serve(service)`` starts a MetricsServer on a free localhost port and
+    returns ``(metrics, port)``; every server stops with the test."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    servers = []
+
+    def start(service):
+        metrics = MetricsServer(service)
+        server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(metrics.serve_connection, '127.0.0.1', 0), loop).result(5)
+        servers.append(server)
+        return metrics, server.sockets[0].getsockname()[1]
+
+    yield start
+
+    async def stop():
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+        # Let connection handlers see their client hang up, then drop the rest
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=1)
+            for task in pending:
+                task.cancel()
+
+    asyncio.run_coroutine_threadsafe(stop(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+
+def get(connection, target, method='GET', **headers):
+    """One request on ``connection``, or on a new connection to that port."""
+    if isinstance(connection, int):
+        connection = http.client.HTTPConnection('127.0.0.1', connection, timeout=5)
+        try:
+            return get(connection, target, method, **headers)
+        finally:
+            connection.close()
+    connection.request(method, target, headers=headers)
+    response = connection.getresponse()
+    return response.status, dict(response.getheaders()), response.read()
+
+
+def test_endpoints_and_not_modified(serve, csv_path):
+    service = DataService(csv_path)
+    metrics, port = serve(service)
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+
+    status, headers, body = get(connection, '/coins')
+    assert status == 200
+    assert json.loads(body) == {'coins': list(service.names)}
+
+    name = service.names[0]
+    target = '/ohlcv?' + urlencode({'name': name, 'start': '2021-02-01', 'end': '2021-02-10'})
+    status, headers, body = get(connection, target)
+    rows = json.loads(body)
+    assert status == 200 and len(rows) == 9 and {row['Name'] for row in rows} == {name}
+
+    # HEAD: same headers and length as GET, no body
+    status, head, body = get(connection, target, 'HEAD')
+    assert status == 200 and body == b''
+    assert head['Content-Length'] == headers['Content-Length'] != '0' and head['ETag'] == headers['ETag']
+
+    # Same keep-alive connection: conditional request is answered with 304
+    status, again, body = get(connection, target, **{'If-None-Match': headers['ETag']})
+    assert status == 304 and body == b'' and again['ETag'] == headers['ETag']
+    assert metrics.hits == 2
+    connection.close()
+
+    status, _, body = get(connection, '/extremes?name=Nope')
+    assert status == 404 and 'error' in json.loads(body)
+
+
+def test_etag_follows_content_across_restarts(serve, csv_path, candles):
+    target = '/performers?parameter=Close&stat=last'
+    _, port = serve(DataService(csv_path))
+    _, before, _ = get(port, target)
+
+    # A restarted server over the same file gives the same ETag...
+    _, port = serve(DataService(csv_path))
+    _, same, _ = get(port, target)
+    assert same['ETag'] == before['ETag']
+
+    # ...and after an ingest and a restart (version back at 0) a new one
+    Ingestor(DataService(csv_path), FrameFeed(candles)).run()
+    _, port = serve(DataService(csv_path))
+    status, after, _ = get(port, target,
+                           **{'If-None-Match': before['ETag']})
+    assert status == 200 and after['ETag'] != before['ETag']
+
+
+def test_compact_schema_serves_numbers(serve, csv_path):
+    service = DataService(csv_path, compact=True)
+    assert service.data['Close'].dtype == 'float32'
+    _, port = serve(service)
+
+    status, _, body = get(port, '/extremes?' + urlencode({'name': service.names[0]}))
+    extremes = json.loads(body)
+    assert status == 200
+    assert isinstance(extremes['Largest Increase (%)'], float)
+    assert isinstance(extremes['Largest Decrease (%)'], float)